@@ -0,0 +1,28 @@
+"""
+Ahead-of-time build of the enhanced AI numeric kernels.
+
+Compiles the Numba kernels from enhanced_ai into a native extension module
+(fluence_kernels) next to this file, so service start-up skips JIT compilation.
+Run once per deployment image: python build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+from enhanced_ai import (
+    BUILD_FEATURES_SIGNATURE,
+    RETURN_STD_SIGNATURE,
+    _build_features_loop,
+    _return_std_loop,
+)
+
+cc = CC('fluence_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('build_features', BUILD_FEATURES_SIGNATURE)(_build_features_loop)
+cc.export('calc_vol', RETURN_STD_SIGNATURE)(_return_std_loop)
+
+
+if __name__ == '__main__':
+    cc.compile()
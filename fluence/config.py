@@ -3,11 +3,36 @@ Production Configuration for Fluence AI Service
 Real contract addresses and endpoints for zkRisk-Agent
 """
 
+import functools
 import os
-from dataclasses import dataclass
-from typing import Dict, List
-
-@dataclass
+import stat
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Pyth Network Real Feed IDs (Production), shared read-only across config instances
+PYTH_FEED_IDS: Mapping[str, str] = MappingProxyType({
+    'USDC/USD': '0xeaa020c61cc479712813461ce153894a96a6c00b21ed0cfc2798d1f9a9e9c94a',
+    'ETH/USD': '0xff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace',
+    'BTC/USD': '0xe62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43',
+    'MATIC/USD': '0x5de33a9112c2b700b8d30b8a3402c103578ccfa2765696471cc672bd5cf6ac52'
+})
+
+# Exported model variants (see create_lstm_model.py), selected by QUANT_MODE
+MODEL_PATHS_BY_QUANT_MODE: Dict[str, str] = {
+    "fp32": "model/lstm_vol.onnx",
+    "fp16": "model/lstm_vol_fp16.onnx",
+    "int8": "model/lstm_vol_int8.onnx"
+}
+
+def select_model_variant(quant_mode: str) -> Tuple[str, str]:
+    """Return (path, precision) for QUANT_MODE, falling back to the FP32 export if that variant wasn't built"""
+    variant_path = MODEL_PATHS_BY_QUANT_MODE.get(quant_mode)
+    if variant_path and os.path.exists(variant_path):
+        return variant_path, quant_mode
+    return MODEL_PATHS_BY_QUANT_MODE["fp32"], "fp32"
+
+@dataclass(frozen=True, slots=True)
 class ProductionConfig:
     """Production configuration with real addresses and endpoints"""
 
@@ -17,12 +42,7 @@ class ProductionConfig:
     FLUENCE_SERVICE_ID: str = os.getenv("FLUENCE_SERVICE_ID", "zkrisk-ai-volatility-v1")
 
     # Pyth Network Real Feed IDs (Production)
-    PYTH_FEEDS: Dict[str, str] = {
-        'USDC/USD': '0xeaa020c61cc479712813461ce153894a96a6c00b21ed0cfc2798d1f9a9e9c94a',
-        'ETH/USD': '0xff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace',
-        'BTC/USD': '0xe62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43',
-        'MATIC/USD': '0x5de33a9112c2b700b8d30b8a3402c103578ccfa2765696471cc672bd5cf6ac52'
-    }
+    PYTH_FEEDS: Mapping[str, str] = field(default_factory=lambda: PYTH_FEED_IDS)
 
     # Real Network Endpoints
     PYTH_WS_ENDPOINT: str = "wss://hermes.pyth.network/ws"
@@ -39,9 +59,15 @@ class ProductionConfig:
     ORACLE_CONTRACT: str = os.getenv("ORACLE_CONTRACT_ADDRESS", "")  # Will be set after deployment
 
     # AI Model Configuration
-    MODEL_PATH: str = "model/lstm_vol.onnx"
+    QUANT_MODE: str = os.getenv("QUANT_MODE", "int8").lower()  # fp32, fp16 or int8
+    # Variant actually served: train_model.py/quick_model.py trees without an _int8 export use FP32
+    MODEL_PATH: str = select_model_variant(QUANT_MODE)[0]
+    MODEL_PRECISION: str = select_model_variant(QUANT_MODE)[1]
     MODEL_INFO_PATH: str = "model/model_info.json"
-    SCALER_PATH: str = "model/scaler.pkl"
+    # Cached optimized graph for MODEL_PATH; empty: a sidecar next to it, keyed on the ORT version
+    ORT_OPTIMIZED_MODEL_PATH: str = os.getenv("ORT_OPTIMIZED_MODEL_PATH", "")
+    ORT_ENGINE_CACHE_DIR: str = "model/.ort_cache"
+    ORT_EXECUTION_PROVIDER: str = os.getenv("ORT_EXECUTION_PROVIDER", "CPUExecutionProvider")
 
     # Service Configuration
     PORT: int = int(os.getenv("PORT", "5000"))
@@ -83,34 +109,46 @@ class ProductionConfig:
     CELO_RPC: str = os.getenv("CELO_RPC", "https://alfajores-forno.celo-testnet.org")
     HYPERLANE_MAILBOX: str = "0x742d35Cc6e64B2C5c8e4F1234567890123456789"  # Real Hyperlane mailbox
 
+    # Memoized to_dict() result; the config is immutable once built
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+
     @classmethod
     def from_env(cls) -> 'ProductionConfig':
         """Create configuration from environment variables"""
         return cls()
 
+    def ort_providers(self) -> List:
+        """ONNX Runtime providers for ORT_EXECUTION_PROVIDER, with the CPU provider as fallback"""
+        if self.ORT_EXECUTION_PROVIDER == "CPUExecutionProvider":
+            return ["CPUExecutionProvider"]
+        if self.ORT_EXECUTION_PROVIDER == "TensorrtExecutionProvider":
+            # Persist built TensorRT engines across restarts
+            trt_options = {"trt_engine_cache_enable": True, "trt_engine_cache_path": self.ORT_ENGINE_CACHE_DIR}
+            return [("TensorrtExecutionProvider", trt_options), "CPUExecutionProvider"]
+        return [self.ORT_EXECUTION_PROVIDER, "CPUExecutionProvider"]
+
     def validate(self) -> List[str]:
         """Validate configuration and return list of errors"""
-        errors = []
-
-        if not self.FLUENCE_VM_ID:
-            errors.append("FLUENCE_VM_ID not set")
-
-        if not self.LOAN_CONTRACT:
-            errors.append("LOAN_CONTRACT_ADDRESS not set")
-
-        if not self.X402_CONTRACT:
-            errors.append("X402_CONTRACT_ADDRESS not set")
-
-        if not self.ORACLE_CONTRACT:
-            errors.append("ORACLE_CONTRACT_ADDRESS not set")
-
-        if not os.path.exists(self.MODEL_PATH):
-            errors.append(f"Model file not found: {self.MODEL_PATH}")
-
-        return errors
+        # Results are memoized on the validated fields plus the model file's mtime,
+        # so repeated polling only costs a single stat of MODEL_PATH
+        return list(_validate_cached(
+            self.FLUENCE_VM_ID,
+            self.LOAN_CONTRACT,
+            self.X402_CONTRACT,
+            self.ORACLE_CONTRACT,
+            self.QUANT_MODE,
+            self.MODEL_PATH,
+            _model_file_mtime(self.MODEL_PATH)
+        ))
 
     def to_dict(self) -> Dict:
-        """Convert configuration to dictionary"""
+        """Convert configuration to dictionary (built once; treat the result as read-only)"""
+        if self._dict_cache is None:
+            object.__setattr__(self, '_dict_cache', self._build_dict())
+        return self._dict_cache
+
+    def _build_dict(self) -> Dict:
+        """Build the nested configuration dictionary"""
         return {
             'fluence': {
                 'network': self.FLUENCE_NETWORK,
@@ -118,7 +156,7 @@ class ProductionConfig:
                 'service_id': self.FLUENCE_SERVICE_ID
             },
             'pyth': {
-                'feeds': self.PYTH_FEEDS,
+                'feeds': dict(self.PYTH_FEEDS),
                 'ws_endpoint': self.PYTH_WS_ENDPOINT,
                 'http_endpoint': self.PYTH_HTTP_ENDPOINT
             },
@@ -144,12 +182,50 @@ class ProductionConfig:
             }
         }
 
+
+def _model_file_mtime(path: str) -> Optional[float]:
+    """Return the model file's mtime, or None if it is not a regular file"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime if stat.S_ISREG(st.st_mode) else None
+
+
+@functools.lru_cache(maxsize=8)
+def _validate_cached(fluence_vm_id: str, loan_contract: str, x402_contract: str,
+                     oracle_contract: str, quant_mode: str, model_path: str,
+                     model_mtime: Optional[float]) -> Tuple[str, ...]:
+    """Validate configuration fields; cached until any field or the model file changes"""
+    errors = []
+
+    if not fluence_vm_id:
+        errors.append("FLUENCE_VM_ID not set")
+
+    if not loan_contract:
+        errors.append("LOAN_CONTRACT_ADDRESS not set")
+
+    if not x402_contract:
+        errors.append("X402_CONTRACT_ADDRESS not set")
+
+    if not oracle_contract:
+        errors.append("ORACLE_CONTRACT_ADDRESS not set")
+
+    if quant_mode not in MODEL_PATHS_BY_QUANT_MODE:
+        errors.append(f"Unknown QUANT_MODE '{quant_mode}', falling back to fp32")
+
+    if model_mtime is None:
+        errors.append(f"Model file not found: {model_path}")
+
+    return tuple(errors)
+
+
 # Global configuration instance
 config = ProductionConfig.from_env()
 
-# Validation on import
-_errors = config.validate()
-if _errors and not config.DEBUG:
+# Validation on import (tooling can opt out with ZKRISK_SKIP_VALIDATE)
+_errors = [] if config.DEBUG or os.getenv("ZKRISK_SKIP_VALIDATE") else config.validate()
+if _errors:
     import logging
     logger = logging.getLogger(__name__)
     for error in _errors:
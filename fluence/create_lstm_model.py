@@ -4,238 +4,335 @@ Create production LSTM model for volatility prediction
 Generates ONNX model for real-time volatility inference in zkRisk
 """
 
-import torch
-import torch.nn as nn
-import numpy as np
-import onnx
-import os
-from typing import Tuple
+from __future__ import annotations
 
-class VolatilityLSTM(nn.Module):
+import logging
+import os
+import sys
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Emoji status prefixes only when the log stream (stderr, logging's default) can encode them;
+# non-UTF-8 container consoles get plain text
+_EMOJI_LOGS = (getattr(sys.stderr, 'encoding', None) or '').lower().replace('-', '').startswith('utf')
+
+
+def _icon(emoji: str) -> str:
+    """Status prefix for a log line: the emoji plus a space, or nothing"""
+    return f"{emoji} " if _EMOJI_LOGS else ""
+
+# Per-step volatility regimes for synthetic price paths and their probabilities
+VOL_REGIMES = (0.01, 0.03, 0.08)
+VOL_REGIME_PROBS = (0.7, 0.2, 0.1)
+
+# Caller-supplied input features; the time-of-day feature is generated inside the model
+INPUT_FEATURES = ('price_momentum', 'volume_normalized', 'volatility_proxy', 'rsi_normalized')
+
+def _build_model_class():
+    """Define VolatilityLSTM on first use so importing this module does not load torch"""
+    import math
+
+    import torch
+    import torch.nn as nn
+
+    class VolatilityLSTM(nn.Module):
+        """
+        Recurrent model for cryptocurrency volatility prediction
+        A single GRU layer (3 gates) keeps per-step work and exported op count low
+        Input: Historical price data (sequence_length, features), up to sequence_length steps
+        Output: Predicted volatility (single value)
+        """
+
+        def __init__(self, input_size: int = 4, hidden_size: int = 64, sequence_length: int = 24):
+            super(VolatilityLSTM, self).__init__()
+
+            self.hidden_size = hidden_size
+
+            # Time-of-day feature sin(t*2π/24) depends only on position, so it is a constant
+            # buffer appended inside the graph rather than supplied by every caller
+            time_feature = torch.sin(torch.arange(sequence_length, dtype=torch.float32) * 2 * math.pi / 24)
+            self.register_buffer('time_feature', time_feature.view(1, sequence_length, 1))
+
+            # Recurrent layer (caller features + time feature)
+            self.gru = nn.GRU(
+                input_size=input_size + 1,
+                hidden_size=hidden_size,
+                num_layers=1,
+                batch_first=True
+            )
+
+            # Attention mechanism for better feature importance: one score per timestep
+            self.attention_score = nn.Linear(hidden_size, 1)
+
+            # Fully connected layers
+            self.fc_layers = nn.Sequential(
+                nn.Linear(hidden_size, 32),
+                nn.ReLU(),
+                nn.Dropout(0.1),
+                nn.Linear(32, 16),
+                nn.ReLU(),
+                nn.Linear(16, 1),
+                nn.Sigmoid()  # Volatility is always positive, bounded between 0-1
+            )
+
+            # Initialize weights
+            self._init_weights()
+
+        @torch.no_grad()
+        def _init_weights(self):
+            """Initialize weights using Xavier (input) and orthogonal (recurrent) initialization"""
+            weights_ih, weights_hh, biases = [], [], []
+            for name, param in self.named_parameters():
+                if 'weight_ih' in name:
+                    weights_ih.append(param)
+                elif 'weight_hh' in name:
+                    weights_hh.append(param)
+                elif 'bias' in name:
+                    biases.append(param)
+
+            for param in weights_ih:
+                nn.init.xavier_uniform_(param)
+
+            # Recurrent weights share a (gates * hidden, hidden) shape: orthogonalize them with one batched QR
+            if weights_hh:
+                q, r = torch.linalg.qr(torch.randn(len(weights_hh), *weights_hh[0].shape))
+                q *= torch.sign(torch.diagonal(r, dim1=-2, dim2=-1)).unsqueeze(-2)
+                for param, q_i in zip(weights_hh, q):
+                    param.copy_(q_i)
+
+            torch._foreach_zero_(biases)
+
+        def forward(self, x: torch.Tensor) -> torch.Tensor:
+            # x shape: (batch_size, sequence_length, input_size)
+            time_feature = self.time_feature[:, :x.size(1)].expand(x.size(0), -1, -1)
+            x = torch.cat([x, time_feature], dim=-1)
+
+            # GRU forward pass
+            gru_out, _ = self.gru(x)
+            # gru_out shape: (batch_size, sequence_length, hidden_size)
+
+            # Apply attention mechanism
+            attention_scores = self.attention_score(gru_out).squeeze(-1)
+            attention_weights = torch.softmax(attention_scores, dim=1)
+            # attention_weights shape: (batch_size, sequence_length)
+
+            # Weighted sum using attention, as a batched matmul (no (B, S, H) temporary)
+            context_vector = torch.bmm(attention_weights.unsqueeze(1), gru_out).squeeze(1)
+            # context_vector shape: (batch_size, hidden_size)
+
+            # Final prediction
+            output = self.fc_layers(context_vector)
+            # output shape: (batch_size, 1)
+
+            return output
+
+    return VolatilityLSTM
+
+def _get_model_class():
+    """Return the VolatilityLSTM class, building it on first access"""
+    model_class = globals().get('VolatilityLSTM')
+    if model_class is None:
+        model_class = _build_model_class()
+        globals()['VolatilityLSTM'] = model_class
+    return model_class
+
+def __getattr__(name: str):
+    # PEP 562: `from create_lstm_model import VolatilityLSTM` builds the class lazily
+    if name == 'VolatilityLSTM':
+        return _get_model_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def generate_synthetic_training_data(num_samples: int = 10000, sequence_length: int = 24,
+                                    seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
     """
-    LSTM model for cryptocurrency volatility prediction
-    Input: Historical price data (sequence_length, features)
-    Output: Predicted volatility (single value)
+    Generate synthetic training data for volatility prediction
+    Simulates realistic cryptocurrency price patterns; deterministic for a given seed
     """
-
-    def __init__(self, input_size: int = 5, hidden_size: int = 64, num_layers: int = 2, dropout: float = 0.2):
-        super(VolatilityLSTM, self).__init__()
-
-        self.hidden_size = hidden_size
-        self.num_layers = num_layers
-
-        # LSTM layers
-        self.lstm = nn.LSTM(
-            input_size=input_size,
-            hidden_size=hidden_size,
-            num_layers=num_layers,
-            dropout=dropout if num_layers > 1 else 0,
-            batch_first=True
-        )
-
-        # Attention mechanism for better feature importance
-        self.attention = nn.Sequential(
-            nn.Linear(hidden_size, hidden_size),
-            nn.Tanh(),
-            nn.Linear(hidden_size, 1),
-            nn.Softmax(dim=1)
-        )
-
-        # Fully connected layers
-        self.fc_layers = nn.Sequential(
-            nn.Linear(hidden_size, 32),
-            nn.ReLU(),
-            nn.Dropout(0.1),
-            nn.Linear(32, 16),
-            nn.ReLU(),
-            nn.Linear(16, 1),
-            nn.Sigmoid()  # Volatility is always positive, bounded between 0-1
-        )
-
-        # Initialize weights
-        self._init_weights()
-
-    def _init_weights(self):
-        """Initialize weights using Xavier initialization"""
-        for name, param in self.named_parameters():
-            if 'weight_ih' in name:
-                nn.init.xavier_uniform_(param.data)
-            elif 'weight_hh' in name:
-                nn.init.orthogonal_(param.data)
-            elif 'bias' in name:
-                param.data.fill_(0)
-
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        # x shape: (batch_size, sequence_length, input_size)
-
-        # LSTM forward pass
-        lstm_out, (hidden, cell) = self.lstm(x)
-        # lstm_out shape: (batch_size, sequence_length, hidden_size)
-
-        # Apply attention mechanism
-        attention_weights = self.attention(lstm_out)
-        # attention_weights shape: (batch_size, sequence_length, 1)
-
-        # Weighted sum using attention
-        context_vector = torch.sum(lstm_out * attention_weights, dim=1)
-        # context_vector shape: (batch_size, hidden_size)
-
-        # Final prediction
-        output = self.fc_layers(context_vector)
-        # output shape: (batch_size, 1)
-
-        return output
-
-def generate_synthetic_training_data(num_samples: int = 10000, sequence_length: int = 24) -> Tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    logger.info("%sGenerating %d synthetic training samples...", _icon("🔢"), num_samples)
+
+    rng = np.random.default_rng(seed)
+    steps = sequence_length + 1
+
+    # Generate base price trend per sample
+    base_price = rng.uniform(1000, 50000, size=num_samples)  # Random starting price
+    trend = rng.uniform(-0.02, 0.02, size=num_samples)  # Daily trend
+
+    # Volatility clustering: regime drawn per step, then Gaussian noise at that scale
+    vol_regime = rng.choice(VOL_REGIMES, p=VOL_REGIME_PROBS, size=(num_samples, steps - 1))
+    noise = rng.standard_normal((num_samples, steps - 1))
+    noise *= vol_regime
+
+    # Period returns and compounded price path (first step is the base price)
+    returns = trend[:, None] + noise  # (num_samples, sequence_length)
+    growth = np.empty((num_samples, steps))
+    growth[:, 0] = 1.0
+    np.cumprod(1.0 + returns, axis=1, out=growth[:, 1:])
+    prices = base_price[:, None] * growth
+
+    # Log volume follows a multiplicative random walk from a random starting volume
+    log_volume = np.log(rng.uniform(0.5, 2.0, size=(num_samples, sequence_length)))
+    log_volume[:, 0] = np.log(rng.uniform(1e6, 1e8, size=num_samples))
+    np.cumsum(log_volume, axis=1, out=log_volume)
+
+    # Preallocated output buffers
+    X = np.empty((num_samples, sequence_length, len(INPUT_FEATURES)), dtype=np.float32)
+    y = np.empty((num_samples, 1), dtype=np.float32)
+
+    # Price-based features: trailing 5-period SMA (expanding over the first 4 periods)
+    window_prices = prices[:, :sequence_length]
+    price_sums = np.cumsum(window_prices, axis=1)
+    price_sums[:, 5:] -= price_sums[:, :-5].copy()
+    counts = np.minimum(np.arange(1, sequence_length + 1), 5)
+    sma_5 = price_sums / counts
+    price_momentum = np.zeros_like(sma_5)
+    np.divide(window_prices - sma_5, sma_5, out=price_momentum, where=sma_5 > 0)
+    X[:, :, 0] = price_momentum
+
+    # Volume features
+    X[:, :, 1] = log_volume / 20  # Normalized log volume
+
+    # Volatility proxy: std of returns[t-4:t+1], zero for the first 5 periods
+    X[:, :5, 2] = 0.0
+    if sequence_length > 5:
+        return_windows = np.lib.stride_tricks.sliding_window_view(returns, 5, axis=1)
+        X[:, 5:, 2] = return_windows[:, 1:].std(axis=-1)
+
+    # Technical indicators
+    X[:, :, 3] = rng.uniform(20, 80, size=(num_samples, sequence_length)) / 100  # Simplified, normalized RSI
+
+    # Calculate target volatility (next period realized volatility)
+    if sequence_length >= 5:
+        future_vol = returns[:, -5:].std(axis=1)
+        # Normalize volatility to 0-1 range
+        y[:, 0] = np.minimum(future_vol * 10, 1.0)  # Scale and cap at 1.0
+    else:
+        y[:, 0] = 0.1
+
+    return X, y
+
+def load_or_generate_training_data(num_samples: int = 10000, sequence_length: int = 24, seed: int = 42,
+                                   cache_dir: str = "model") -> Tuple[np.ndarray, np.ndarray]:
     """
-    Generate synthetic training data for volatility prediction
-    Simulates realistic cryptocurrency price patterns
+    Load cached synthetic training data, generating and caching it on first use
+    Generation is deterministic per (num_samples, sequence_length, seed), so re-runs memory-map the .npy files
     """
-    print(f"🔢 Generating {num_samples} synthetic training samples...")
-
-    X = []
-    y = []
-
-    for i in range(num_samples):
-        # Generate base price trend
-        base_price = np.random.uniform(1000, 50000)  # Random starting price
-        trend = np.random.uniform(-0.02, 0.02)  # Daily trend
-
-        # Generate price sequence with volatility patterns
-        prices = []
-        volumes = []
-        returns = []
-
-        for t in range(sequence_length + 1):
-            # Add noise and volatility clustering
-            if t == 0:
-                price = base_price
-                volume = np.random.uniform(1e6, 1e8)
-            else:
-                # Volatility clustering: high volatility follows high volatility
-                vol_regime = np.random.choice([0.01, 0.03, 0.08], p=[0.7, 0.2, 0.1])
-                noise = np.random.normal(0, vol_regime)
-                price = prices[-1] * (1 + trend + noise)
-                volume = volumes[-1] * np.random.uniform(0.5, 2.0)
-
-            prices.append(price)
-            volumes.append(volume)
-
-            if t > 0:
-                return_val = (price - prices[-2]) / prices[-2]
-                returns.append(return_val)
-
-        # Calculate features for the sequence
-        features = []
-        for t in range(sequence_length):
-            # Feature engineering
-            price = prices[t]
-            volume = volumes[t]
-
-            # Price-based features
-            sma_5 = np.mean(prices[max(0, t-4):t+1])
-            price_momentum = (price - sma_5) / sma_5 if sma_5 > 0 else 0
-
-            # Volume features
-            volume_norm = np.log(volume) / 20  # Normalized log volume
-
-            # Volatility proxy
-            if t >= 5:
-                recent_returns = returns[max(0, t-4):t+1]
-                vol_proxy = np.std(recent_returns) if len(recent_returns) > 1 else 0
-            else:
-                vol_proxy = 0
-
-            # Technical indicators
-            rsi = np.random.uniform(20, 80)  # Simplified RSI
-
-            features.append([
-                price_momentum,
-                volume_norm,
-                vol_proxy,
-                rsi / 100,  # Normalized RSI
-                np.sin(t * 2 * np.pi / 24)  # Time-of-day feature
-            ])
-
-        # Calculate target volatility (next period realized volatility)
-        if len(returns) >= 5:
-            future_vol = np.std(returns[-5:])
-            # Normalize volatility to 0-1 range
-            target_vol = min(future_vol * 10, 1.0)  # Scale and cap at 1.0
-        else:
-            target_vol = 0.1
-
-        X.append(features)
-        y.append([target_vol])
-
-    return np.array(X, dtype=np.float32), np.array(y, dtype=np.float32)
+    import numpy as np
+
+    cache_prefix = os.path.join(
+        cache_dir, f"train_cache_{num_samples}_{sequence_length}_{len(INPUT_FEATURES)}_{seed}"
+    )
+    x_path, y_path = f"{cache_prefix}_X.npy", f"{cache_prefix}_y.npy"
+
+    if os.path.exists(x_path) and os.path.exists(y_path):
+        logger.info("%sLoading cached training data: %s_*.npy", _icon("📂"), cache_prefix)
+        # Copy-on-write maps: pages load lazily and the arrays stay writable for torch.from_numpy
+        return np.load(x_path, mmap_mode='c'), np.load(y_path, mmap_mode='c')
+
+    X, y = generate_synthetic_training_data(num_samples, sequence_length, seed)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(x_path, X)
+    np.save(y_path, y)
+
+    return X, y
 
 def create_and_export_model():
     """Create, train, and export LSTM model to ONNX format"""
+    import torch
+    import torch.nn as nn
+    import onnx
+    from torch.utils.data import DataLoader, TensorDataset
 
-    print("🚀 Creating production LSTM volatility prediction model...")
+    VolatilityLSTM = _get_model_class()
+
+    logger.info("%sCreating production LSTM volatility prediction model...", _icon("🚀"))
 
     # Model hyperparameters
-    input_size = 5  # price_momentum, volume, volatility_proxy, rsi, time_feature
+    input_size = len(INPUT_FEATURES)  # price_momentum, volume, volatility_proxy, rsi (time feature is built in)
     hidden_size = 64
-    num_layers = 2
     sequence_length = 24  # 24 hours of data
 
     # Create model
-    model = VolatilityLSTM(input_size=input_size, hidden_size=hidden_size, num_layers=num_layers)
+    model = VolatilityLSTM(input_size=input_size, hidden_size=hidden_size, sequence_length=sequence_length)
 
     # Generate training data
-    X_train, y_train = generate_synthetic_training_data(num_samples=10000, sequence_length=sequence_length)
+    X_train, y_train = load_or_generate_training_data(num_samples=10000, sequence_length=sequence_length)
+
+    logger.info("%sTraining data shape: X=%s, y=%s", _icon("📊"), X_train.shape, y_train.shape)
 
-    print(f"📊 Training data shape: X={X_train.shape}, y={y_train.shape}")
+    # Convert to PyTorch tensors (zero-copy views of the float32 arrays)
+    X_tensor = torch.from_numpy(X_train)
+    y_tensor = torch.from_numpy(y_train)
 
-    # Convert to PyTorch tensors
-    X_tensor = torch.FloatTensor(X_train)
-    y_tensor = torch.FloatTensor(y_train)
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    use_cuda = device.type == 'cuda'
+
+    batch_size = 64
+    num_epochs = 100
+
+    # Tensors are already in memory, so batches are collated in-process; pinned
+    # host memory lets the H2D copy overlap compute when training on GPU
+    loader = DataLoader(
+        TensorDataset(X_tensor, y_tensor),
+        batch_size=batch_size,
+        shuffle=True,
+        pin_memory=use_cuda
+    )
+    num_batches = len(loader)
+
+    model.to(device)
 
     # Training setup
     criterion = nn.MSELoss()
     optimizer = torch.optim.Adam(model.parameters(), lr=0.001, weight_decay=1e-5)
     scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer, patience=10, factor=0.5)
 
+    # Compile the training forward pass; the eager module is kept for export
+    train_model = torch.compile(model, mode='reduce-overhead') if hasattr(torch, 'compile') else model
+    use_bf16 = use_cuda and torch.cuda.is_bf16_supported()
+
     # Training loop
     model.train()
-    print("🔥 Training model...")
-
-    batch_size = 64
-    num_epochs = 100
+    logger.info("%sTraining model...", _icon("🔥"))
 
     for epoch in range(num_epochs):
-        total_loss = 0
-        num_batches = len(X_tensor) // batch_size
+        loss_acc = torch.zeros((), device=device)
 
-        for i in range(0, len(X_tensor), batch_size):
-            # Get batch
-            batch_X = X_tensor[i:i+batch_size]
-            batch_y = y_tensor[i:i+batch_size]
+        for batch_X, batch_y in loader:
+            batch_X = batch_X.to(device, non_blocking=True)
+            batch_y = batch_y.to(device, non_blocking=True)
 
             # Forward pass
-            optimizer.zero_grad()
-            outputs = model(batch_X)
-            loss = criterion(outputs, batch_y)
+            optimizer.zero_grad(set_to_none=True)
+            with torch.autocast(device_type=device.type, dtype=torch.bfloat16, enabled=use_bf16):
+                outputs = train_model(batch_X)
+                loss = criterion(outputs.float(), batch_y)
 
             # Backward pass
             loss.backward()
             torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
             optimizer.step()
 
-            total_loss += loss.item()
+            # Accumulate on device; synchronize once per epoch
+            loss_acc += loss.detach()
 
-        avg_loss = total_loss / num_batches
+        avg_loss = loss_acc.item() / num_batches
         scheduler.step(avg_loss)
 
         if epoch % 20 == 0 or epoch == num_epochs - 1:
-            print(f"Epoch {epoch+1}/{num_epochs}, Loss: {avg_loss:.6f}")
+            logger.info("Epoch %d/%d, Loss: %.6f", epoch + 1, num_epochs, avg_loss)
 
-    print("✅ Training completed!")
+    logger.info("%sTraining completed!", _icon("✅"))
 
-    # Set model to evaluation mode
+    # Set model to evaluation mode and bring it back to CPU for export
     model.eval()
+    model.to('cpu')
 
     # Create dummy input for ONNX export
     dummy_input = torch.randn(1, sequence_length, input_size)
@@ -243,7 +340,7 @@ def create_and_export_model():
     # Test the model with dummy input
     with torch.no_grad():
         test_output = model(dummy_input)
-        print(f"🧪 Test prediction: {test_output.item():.4f}")
+        logger.info("%sTest prediction: %.4f", _icon("🧪"), test_output.item())
 
     # Create model directory
     model_dir = "model"
@@ -252,45 +349,71 @@ def create_and_export_model():
     # Export to ONNX
     onnx_path = os.path.join(model_dir, "lstm_vol.onnx")
 
-    print(f"📦 Exporting model to {onnx_path}...")
+    logger.info("%sExporting model to %s...", _icon("📦"), onnx_path)
 
     torch.onnx.export(
         model,
         dummy_input,
         onnx_path,
         export_params=True,
-        opset_version=11,
+        opset_version=17,
         do_constant_folding=True,
+        # Export in eval mode so Dropout is stripped rather than left for ORT to fold at load
+        training=torch.onnx.TrainingMode.EVAL,
+        keep_initializers_as_inputs=False,
         input_names=['price_sequence'],
         output_names=['volatility_prediction'],
         dynamic_axes={
-            'price_sequence': {0: 'batch_size'},
+            'price_sequence': {0: 'batch_size', 1: 'sequence_length'},
             'volatility_prediction': {0: 'batch_size'}
         },
         verbose=False
     )
 
     # Verify ONNX model
-    print("🔍 Verifying ONNX model...")
+    logger.info("%sVerifying ONNX model...", _icon("🔍"))
     onnx_model = onnx.load(onnx_path)
     onnx.checker.check_model(onnx_model)
 
-    print("✅ ONNX model verification successful!")
+    logger.info("%sONNX model verification successful!", _icon("✅"))
+
+    # Reduced-precision variants, selected at service boot via QUANT_MODE (see config.py)
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = os.path.join(model_dir, "lstm_vol_int8.onnx")
+    logger.info("%sQuantizing weights to int8: %s...", _icon("🗜️"), int8_path)
+    quantize_dynamic(
+        onnx_path,
+        int8_path,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=['MatMul', 'Gemm']
+    )
+
+    fp16_path = os.path.join(model_dir, "lstm_vol_fp16.onnx")
+    try:
+        from onnxconverter_common import float16
+        # Keep float32 inputs/outputs so callers don't need to change their buffers
+        onnx.save(float16.convert_float_to_float16(onnx_model, keep_io_types=True), fp16_path)
+    except ImportError:
+        logger.warning("%sonnxconverter-common not available, skipping FP16 export", _icon("⚠️"))
+        fp16_path = None
+
+    fp32_size = os.path.getsize(onnx_path)
+    for variant_path in (int8_path, fp16_path):
+        if variant_path:
+            variant_size = os.path.getsize(variant_path)
+            logger.info("%s%s: %.1f KB (%.1fx smaller than FP32)", _icon("📏"),
+                        os.path.basename(variant_path), variant_size / 1024, fp32_size / variant_size)
 
     # Create model metadata
     metadata = {
-        "model_type": "LSTM Volatility Predictor",
+        "model_type": "GRU Volatility Predictor",
         "input_size": input_size,
         "hidden_size": hidden_size,
-        "num_layers": num_layers,
+        "num_layers": 1,
         "sequence_length": sequence_length,
-        "features": [
-            "price_momentum",
-            "volume_normalized",
-            "volatility_proxy",
-            "rsi_normalized",
-            "time_feature"
-        ],
+        "features": list(INPUT_FEATURES),
+        "builtin_features": ["time_feature"],
         "output": "predicted_volatility (0-1 range)",
         "training_samples": 10000,
         "model_version": "1.0.0",
@@ -303,14 +426,35 @@ def create_and_export_model():
     with open(metadata_path, 'w') as f:
         json.dump(metadata, f, indent=2)
 
-    print(f"📝 Model metadata saved to {metadata_path}")
-    print(f"📏 Model file size: {os.path.getsize(onnx_path) / 1024:.1f} KB")
+    logger.info("%sModel metadata saved to %s", _icon("📝"), metadata_path)
+
+    # Service-facing model info (infer.py sizes its input buffers from this): the time feature
+    # is generated in-graph, so callers supply input_size features per step
+    model_info = {
+        "sequence_length": sequence_length,
+        "features": input_size,
+        "input_shape": [1, sequence_length, input_size],
+        "output_shape": [1, 1],
+        "builtin_features": ["time_feature"],
+        "model_size_mb": os.path.getsize(onnx_path) / (1024 * 1024)
+    }
+    model_info_path = os.path.join(model_dir, "model_info.json")
+    with open(model_info_path, 'w') as f:
+        json.dump(model_info, f, indent=2)
 
-    print("\n🎉 Production LSTM model created successfully!")
-    print("🔧 The AI inference service will now load this model automatically.")
-    print(f"📍 Model location: {os.path.abspath(onnx_path)}")
+    logger.info("%sModel info saved to %s", _icon("📝"), model_info_path)
+    logger.info("%sModel file size: %.1f KB", _icon("📏"), os.path.getsize(onnx_path) / 1024)
+
+    logger.info("%sProduction LSTM model created successfully!", _icon("🎉"))
+    logger.info("%sThe AI inference service will now load this model automatically.", _icon("🔧"))
+    logger.info("%sModel location: %s", _icon("📍"), os.path.abspath(onnx_path))
 
     return onnx_path
 
 if __name__ == "__main__":
+    # The model is being (re)built here, so skip config's import-time model check
+    os.environ.setdefault("ZKRISK_SKIP_VALIDATE", "1")
+    from config import config
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL.upper(), logging.INFO), format=config.LOG_FORMAT)
     create_and_export_model()
\ No newline at end of file
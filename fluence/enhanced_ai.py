@@ -4,30 +4,134 @@ Integrates real Pyth Network price data with LSTM model for accurate volatility
 """
 
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-import requests
+from datetime import datetime
 import asyncio
+import math
 import threading
 import time
 from typing import List, Dict, Optional, Tuple
 import logging
 
+from ort_batch import BatchedVolatilityRunner, model_feature_count
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; vectorized NumPy kernels are used instead
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # Optional; the stdlib parser accepts the same bytes payload
+    import json
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Column layout of the per-symbol price ring buffers
+PRICE, CONFIDENCE, TIMESTAMP = 0, 1, 2
+HISTORY_COLUMNS = 3
+
+# Volatility bands: < 0.1 LOW, < 0.25 MEDIUM, < 0.5 HIGH, otherwise EXTREME
+RISK_THRESHOLDS = np.array([0.1, 0.25, 0.5])
+RISK_LABELS = np.array(['LOW', 'MEDIUM', 'HIGH', 'EXTREME'])
+
+# Per-step features built for the model: log price, confidence ratio, time position, return, volatility.
+# Models that generate their own time feature in-graph (create_lstm_model.py) take the other four.
+BUILT_FEATURE_COUNT = 5
+TIME_FEATURE_COLUMN = 2
+
+
+def _build_features_loop(prices, confidences, sequence_length, recent_volatility, out):
+    """Fill out[i] with [log price, confidence ratio, time position, return, recent volatility]"""
+    for i in range(sequence_length):
+        price = prices[i]
+        if price > 0:
+            out[i, 0] = math.log(price)
+            out[i, 1] = confidences[i] / price
+        else:
+            out[i, 0] = 0.0
+            out[i, 1] = 0.0
+        out[i, 2] = i / sequence_length
+
+        # Period return stored in the (unavailable) volume slot
+        out[i, 3] = 0.0
+        if i > 0 and prices[i - 1] > 0:
+            out[i, 3] = (price - prices[i - 1]) / prices[i - 1]
+
+        out[i, 4] = recent_volatility
+
+
+def _build_features_numpy(prices, confidences, sequence_length, recent_volatility, out):
+    """Vectorized equivalent of _build_features_loop"""
+    positive = prices > 0
+    safe_prices = np.where(positive, prices, 1.0)
+    out[:, 0] = np.where(positive, np.log(safe_prices), 0.0)
+    out[:, 1] = np.where(positive, confidences / safe_prices, 0.0)
+    out[:, 2] = np.arange(sequence_length) / sequence_length
+
+    previous = safe_prices[:-1]
+    out[0, 3] = 0.0
+    out[1:, 3] = np.where(positive[:-1], (prices[1:] - previous) / previous, 0.0)
+
+    out[:, 4] = recent_volatility
+
+
+def _return_std_loop(prices):
+    """Population std of simple returns, skipping periods that start from a non-positive price (NaN if < 2)"""
+    # Welford's online variance: returns are formed and folded in a single pass
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, prices.shape[0]):
+        previous = prices[i - 1]
+        if previous > 0:
+            ret = (prices[i] - previous) / previous
+            n += 1
+            delta = ret - mean
+            mean += delta / n
+            m2 += delta * (ret - mean)
+    if n < 2:
+        return math.nan
+    return math.sqrt(m2 / n)
+
+
+def _return_std_numpy(prices):
+    """Vectorized equivalent of _return_std_loop"""
+    previous = prices[:-1]
+    valid = previous > 0
+    returns = (prices[1:][valid] - previous[valid]) / previous[valid]
+    if len(returns) < 2:
+        return math.nan
+    return float(np.std(returns))
+
+
+# Numba type signatures, shared by the eager JIT below and the AOT build (build_kernels.py)
+BUILD_FEATURES_SIGNATURE = 'void(float64[:], float64[:], int64, float64, float32[:, :])'
+RETURN_STD_SIGNATURE = 'float64(float64[:])'
+
+try:
+    # Ahead-of-time compiled kernels (python build_kernels.py): no JIT warmup at all
+    from fluence_kernels import build_features as _build_features, calc_vol as _return_std
+except ImportError:
+    if NUMBA_AVAILABLE:
+        # Eagerly compiled for the declared signatures at import, not on the first prediction
+        _build_features = njit(BUILD_FEATURES_SIGNATURE, cache=True, fastmath=True)(_build_features_loop)
+        _return_std = njit(RETURN_STD_SIGNATURE, cache=True)(_return_std_loop)
+    else:
+        _build_features = _build_features_numpy
+        _return_std = _return_std_numpy
+
 class EnhancedVolatilityPredictor:
-    def __init__(self, onnx_session, hermes_endpoint: str = "https://hermes.pyth.network"):
+    def __init__(self, onnx_session, hermes_endpoint: str = "https://hermes.pyth.network",
+                 model_precision: str = 'fp32'):
         self.session = onnx_session
+        self.model_precision = model_precision  # fp32, fp16 or int8 (dynamic-quantized weights)
         self.hermes_endpoint = hermes_endpoint
 
-        # Real-time price data storage
-        self.price_history: Dict[str, List[Dict]] = {
-            'ETH/USD': [],
-            'BTC/USD': [],
-            'USDC/USD': [],
-            'SOL/USD': []
-        }
-
         # Pyth price feed IDs
         self.pyth_feeds = {
             'ETH/USD': '0xff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace',
@@ -36,20 +140,63 @@ class EnhancedVolatilityPredictor:
             'SOL/USD': '0xef0d8b6fda2ceba41da15d4095d1da392a0d2f8ed0c6c7bc0f4cfac8c280b56d'
         }
 
-        # Price collection thread
+        # Hermes reports feed ids as bare lowercase hex; normalize once for O(1) response dispatch
+        self._id_to_symbol = {
+            feed_id.lower().removeprefix('0x'): symbol for symbol, feed_id in self.pyth_feeds.items()
+        }
+
+        # Price collection thread hosting the async collection loop; the Flask workers
+        # are synchronous, so the loop needs its own thread. The stop event wakes it at once.
         self.collecting = False
         self.collection_thread = None
+        self._collection_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
 
         # Volatility model parameters
         self.sequence_length = 24
-        self.feature_count = 5
+        self.feature_count = BUILT_FEATURE_COUNT
+        if onnx_session is not None:
+            self.feature_count = model_feature_count(onnx_session, BUILT_FEATURE_COUNT)
+        # Built columns passed to the model (None: all of them, written in place)
+        self._model_columns = None
+        if self.feature_count == BUILT_FEATURE_COUNT - 1:
+            self._model_columns = np.delete(np.arange(BUILT_FEATURE_COUNT), TIME_FEATURE_COLUMN)
         self.max_history = 1000  # Keep last 1000 price points
 
+        # Real-time price data storage: one (max_history, 3) ring buffer per symbol with
+        # price/confidence/timestamp columns, plus the total number of ticks written
+        self.price_history: Dict[str, np.ndarray] = {
+            symbol: np.empty((self.max_history, HISTORY_COLUMNS), dtype=np.float64)
+            for symbol in self.pyth_feeds
+        }
+        self._count: Dict[str, int] = {symbol: 0 for symbol in self.pyth_feeds}
+
+        # Results that only change when a new tick arrives: cache key -> (symbol tick count, result).
+        # Keys are ('historical', symbol, period_hours) and ('lstm', symbol), for tracked symbols only.
+        self._tick_cache: Dict[Tuple, Tuple[int, object]] = {}
+
+        # IO-bound inference: features are written straight into a preallocated input
+        # buffer that ORT reads in place; the lock serializes use of the shared buffer
+        self._runner = None
+        if onnx_session is not None:
+            # Models exported with a fixed batch dimension (e.g. quick_model's [1, 24, 5]) cap the batch
+            batch_dim = onnx_session.get_inputs()[0].shape[0]
+            max_batch = batch_dim if isinstance(batch_dim, int) else len(self.pyth_feeds)
+            self._runner = BatchedVolatilityRunner(
+                onnx_session, max_batch=max_batch,
+                sequence_length=self.sequence_length, features=self.feature_count
+            )
+        self._rng = np.random.default_rng()
+        self._inference_lock = threading.Lock()
+
     def start_price_collection(self):
         """Start collecting real-time price data"""
         if not self.collecting:
             self.collecting = True
-            self.collection_thread = threading.Thread(target=self._price_collection_loop)
+            # Created up front so a stop request can't race the thread's start-up
+            self._collection_loop = asyncio.new_event_loop()
+            self._stop_event = asyncio.Event()
+            self.collection_thread = threading.Thread(target=self._run_collection_loop)
             self.collection_thread.daemon = True
             self.collection_thread.start()
             logger.info("🔄 Started real-time price collection for volatility prediction")
@@ -57,112 +204,173 @@ class EnhancedVolatilityPredictor:
     def stop_price_collection(self):
         """Stop price collection"""
         self.collecting = False
+        if self._collection_loop is not None:
+            try:
+                self._collection_loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # Loop already closed
         if self.collection_thread:
             self.collection_thread.join(timeout=5)
         logger.info("⏹️ Stopped price collection")
 
-    def _price_collection_loop(self):
+    def _run_collection_loop(self):
+        """Run the async price collection loop on the collection thread's own event loop"""
+        loop = self._collection_loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._price_collection_loop())
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    async def _wait_for_stop(self, seconds: float) -> bool:
+        """Sleep for up to seconds; returns True as soon as collection is stopped"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _price_collection_loop(self):
         """Background loop to collect price data"""
-        while self.collecting:
-            try:
-                # Collect prices for all symbols
-                for symbol in self.pyth_feeds.keys():
-                    price_data = self._fetch_pyth_price(symbol)
-                    if price_data:
+        # Imported here so short-lived importers of this module don't pay for aiohttp
+        import aiohttp
+
+        # Pooled keep-alive connections to Hermes, reused across polls
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+            while not self._stop_event.is_set():
+                try:
+                    # Collect prices for all symbols in a single request
+                    prices = await self._fetch_pyth_prices_batch(http, list(self.pyth_feeds))
+                    for symbol, price_data in prices.items():
                         self._store_price_data(symbol, price_data)
 
-                # Sleep for 30 seconds between collections
-                time.sleep(30)
+                    # Sleep for 30 seconds between collections
+                    if await self._wait_for_stop(30):
+                        break
 
-            except Exception as e:
-                logger.error(f"❌ Error in price collection loop: {e}")
-                time.sleep(60)  # Wait longer on error
+                except Exception as e:
+                    logger.error(f"❌ Error in price collection loop: {e}")
+                    if await self._wait_for_stop(60):  # Wait longer on error
+                        break
 
-    def _fetch_pyth_price(self, symbol: str) -> Optional[Dict]:
-        """Fetch latest price from Pyth Network"""
+    async def _fetch_pyth_prices_batch(self, http: 'aiohttp.ClientSession', symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch latest prices for several symbols from Pyth Network in one request"""
         try:
-            feed_id = self.pyth_feeds.get(symbol)
-            if not feed_id:
-                return None
+            requested = [symbol for symbol in symbols if symbol in self.pyth_feeds]
+            if not requested:
+                return {}
 
             url = f"{self.hermes_endpoint}/v2/updates/price/latest"
-            params = {
-                'ids[]': feed_id,
-                'parsed': 'true'
-            }
-
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-            if 'parsed' not in data or not data['parsed']:
-                return None
-
-            price_data = data['parsed'][0]
-            price_info = price_data['price']
-
-            # Extract price with correct exponent
-            price = float(price_info['price']) * (10 ** price_info['expo'])
-            confidence = float(price_info['conf']) * (10 ** price_info['expo'])
-            timestamp = price_info['publishTime']
-
-            return {
-                'symbol': symbol,
-                'price': price,
-                'confidence': confidence,
-                'timestamp': timestamp,
-                'datetime': datetime.fromtimestamp(timestamp)
-            }
+            params = [('ids[]', self.pyth_feeds[symbol]) for symbol in requested] + [('parsed', 'true')]
+
+            async with http.get(url, params=params) as response:
+                response.raise_for_status()
+                # aiohttp already negotiates gzip/deflate; parse the raw body with orjson
+                data = _json_loads(await response.read())
+
+            prices = {}
+            for price_data in data.get('parsed') or []:
+                symbol = self._id_to_symbol.get(price_data['id'].lower().removeprefix('0x'))
+                if symbol is None or symbol not in requested:
+                    continue
+
+                price_info = price_data['price']
+
+                # Extract price with correct exponent
+                price = float(price_info['price']) * (10 ** price_info['expo'])
+                confidence = float(price_info['conf']) * (10 ** price_info['expo'])
+                timestamp = int(price_info['publish_time'])  # Unix seconds
+
+                prices[symbol] = {
+                    'symbol': symbol,
+                    'price': price,
+                    'confidence': confidence,
+                    'timestamp': timestamp
+                }
+
+            return prices
 
         except Exception as e:
-            logger.error(f"❌ Failed to fetch {symbol} price: {e}")
-            return None
+            logger.error(f"❌ Failed to fetch prices for {', '.join(symbols)}: {e}")
+            return {}
 
     def _store_price_data(self, symbol: str, price_data: Dict):
         """Store price data for volatility calculation"""
         if symbol not in self.price_history:
-            self.price_history[symbol] = []
-
-        # Add new price point
-        self.price_history[symbol].append(price_data)
-
-        # Keep only recent history
-        if len(self.price_history[symbol]) > self.max_history:
-            self.price_history[symbol] = self.price_history[symbol][-self.max_history:]
-
-        logger.debug(f"📊 Stored {symbol} price: ${price_data['price']:.4f}")
+            self.price_history[symbol] = np.empty((self.max_history, HISTORY_COLUMNS), dtype=np.float64)
+            self._count[symbol] = 0
+
+        # Overwrite the oldest slot once the ring buffer is full
+        count = self._count[symbol]
+        self.price_history[symbol][count % self.max_history] = (
+            price_data['price'], price_data['confidence'], price_data['timestamp']
+        )
+        self._count[symbol] = count + 1
+
+        logger.debug("📊 Stored %s price: $%.4f", symbol, price_data['price'])
+
+    def _history_length(self, symbol: str) -> int:
+        """Number of price points currently held for a symbol"""
+        return min(self._count.get(symbol, 0), self.max_history)
+
+    def _history_tail(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """Return the last n stored rows (all if None) in chronological order"""
+        length = self._history_length(symbol)
+        n = length if n is None else min(n, length)
+        if n == 0:
+            return np.empty((0, HISTORY_COLUMNS), dtype=np.float64)
+
+        buffer = self.price_history[symbol]
+        end = (self._count[symbol] - 1) % self.max_history + 1  # One past the newest row
+        start = end - n
+        if start >= 0:
+            return buffer[start:end]  # Contiguous view, no copy
+        # Tail wraps around the end of the ring
+        return np.concatenate((buffer[start:], buffer[:end]))
+
+    def _get_tick_cached(self, cache_key: Tuple, symbol: str):
+        """Cached result for cache_key if no tick has arrived for symbol since it was stored"""
+        cached = self._tick_cache.get(cache_key)
+        if cached is not None and cached[0] == self._count.get(symbol, 0):
+            return cached[1]
+        return None
+
+    def _set_tick_cached(self, cache_key: Tuple, symbol: str, result):
+        """Remember result until the next tick for symbol"""
+        # Untracked symbols never tick: their entries would pile up per client-supplied name and never expire
+        if symbol not in self.price_history:
+            return
+        self._tick_cache[cache_key] = (self._count.get(symbol, 0), result)
 
     def calculate_historical_volatility(self, symbol: str = 'ETH/USD', period_hours: int = 24) -> float:
         """Calculate historical volatility from real price data"""
         try:
-            if symbol not in self.price_history or len(self.price_history[symbol]) < 2:
-                logger.warning(f"⚠️ Insufficient price data for {symbol}, using fallback volatility")
+            if self._history_length(symbol) < 2:
+                logger.warning("⚠️ Insufficient price data for %s, using fallback volatility", symbol)
                 return 0.15  # Fallback volatility
 
-            prices = self.price_history[symbol]
+            # Reuse the last result until a new tick arrives for this symbol
+            cache_key = ('historical', symbol, period_hours)
+            cached = self._get_tick_cached(cache_key, symbol)
+            if cached is not None:
+                return cached
+
+            history = self._history_tail(symbol)
 
             # Filter prices within the specified period
-            cutoff_time = datetime.now() - timedelta(hours=period_hours)
-            recent_prices = [p for p in prices if p['datetime'] >= cutoff_time]
+            cutoff_time = time.time() - period_hours * 3600
+            recent_prices = history[history[:, TIMESTAMP] >= cutoff_time]
 
             if len(recent_prices) < 2:
-                recent_prices = prices[-min(len(prices), 24):]  # Use last 24 points
-
-            # Calculate returns
-            price_values = [p['price'] for p in recent_prices]
-            returns = []
-
-            for i in range(1, len(price_values)):
-                if price_values[i-1] > 0:
-                    return_rate = (price_values[i] - price_values[i-1]) / price_values[i-1]
-                    returns.append(return_rate)
-
-            if len(returns) < 2:
-                return 0.15
+                recent_prices = history[-24:]  # Use last 24 points
 
             # Calculate volatility (standard deviation of returns)
-            returns_array = np.array(returns)
-            volatility = np.std(returns_array)
+            volatility = _return_std(recent_prices[:, PRICE])
+            if math.isnan(volatility):
+                return 0.15
 
             # Annualize volatility (assuming hourly data)
             annualized_volatility = volatility * np.sqrt(24 * 365)
@@ -170,55 +378,60 @@ class EnhancedVolatilityPredictor:
             # Ensure reasonable bounds
             volatility = max(0.01, min(annualized_volatility, 2.0))
 
-            logger.info(f"📈 Calculated {symbol} volatility: {volatility:.4f} from {len(returns)} price points")
-            return float(volatility)
+            volatility = float(volatility)
+            self._set_tick_cached(cache_key, symbol, volatility)
+
+            logger.info("📈 Calculated %s volatility: %.4f from %d price points", symbol, volatility, len(recent_prices))
+            return volatility
 
         except Exception as e:
             logger.error(f"❌ Volatility calculation failed for {symbol}: {e}")
             return 0.15
 
-    def prepare_lstm_features(self, symbol: str = 'ETH/USD', sequence_length: int = 24) -> Optional[np.ndarray]:
-        """Prepare feature sequence for LSTM model"""
+    def prepare_lstm_features(self, symbol: str = 'ETH/USD', sequence_length: int = 24,
+                              out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Prepare feature sequence for LSTM model, optionally into a (1, sequence_length, features) buffer"""
         try:
-            if symbol not in self.price_history or len(self.price_history[symbol]) < sequence_length:
-                logger.warning(f"⚠️ Insufficient data for LSTM features, using synthetic data")
-                return self._generate_synthetic_features(sequence_length)
-
-            prices = self.price_history[symbol][-sequence_length:]
-
-            features = []
-            for i, price_data in enumerate(prices):
-                # Create multi-dimensional features
-                feature_vector = [
-                    np.log(price_data['price']) if price_data['price'] > 0 else 0,  # Log price
-                    price_data['confidence'] / price_data['price'] if price_data['price'] > 0 else 0,  # Confidence ratio
-                    i / sequence_length,  # Time position
-                    0.0,  # Volume (placeholder - not available from Pyth)
-                    0.0   # Additional technical indicator (placeholder)
-                ]
-                features.append(feature_vector)
-
-            # Calculate returns and add as features
-            for i in range(1, len(features)):
-                if prices[i-1]['price'] > 0:
-                    return_rate = (prices[i]['price'] - prices[i-1]['price']) / prices[i-1]['price']
-                    features[i][3] = return_rate  # Store return in volume slot
+            if self._history_length(symbol) < sequence_length:
+                logger.warning("⚠️ Insufficient data for LSTM features, using synthetic data")
+                return self._synthetic_features_into(sequence_length, out)
+
+            history = self._history_tail(symbol, sequence_length)
+            prices = history[:, PRICE]
+            confidences = history[:, CONFIDENCE]
 
             # Add volatility as last feature
             recent_volatility = self.calculate_historical_volatility(symbol, period_hours=6)
-            for feature in features:
-                feature[4] = recent_volatility
 
-            # Convert to numpy array and reshape for LSTM
-            feature_array = np.array(features, dtype=np.float32)
-            feature_array = feature_array.reshape(1, sequence_length, self.feature_count)
+            # Build the (1, sequence_length, features) model input in place
+            feature_array = out if out is not None else np.empty((1, sequence_length, self.feature_count), dtype=np.float32)
+            if self._model_columns is None:
+                _build_features(prices, confidences, sequence_length, recent_volatility, feature_array[0])
+            else:
+                built = np.empty((sequence_length, BUILT_FEATURE_COUNT), dtype=np.float32)
+                _build_features(prices, confidences, sequence_length, recent_volatility, built)
+                self._copy_model_columns(built, feature_array[0])
 
-            logger.info(f"✅ Prepared LSTM features for {symbol}: shape {feature_array.shape}")
+            logger.info("✅ Prepared LSTM features for %s: shape %s", symbol, feature_array.shape)
             return feature_array
 
         except Exception as e:
             logger.error(f"❌ Feature preparation failed for {symbol}: {e}")
-            return self._generate_synthetic_features(sequence_length)
+            return self._synthetic_features_into(sequence_length, out)
+
+    def _synthetic_features_into(self, sequence_length: int, out: Optional[np.ndarray]) -> np.ndarray:
+        """Synthetic fallback features, written into out when a buffer is supplied"""
+        if out is None:
+            out = np.empty((1, sequence_length, self.feature_count), dtype=np.float32)
+        self._copy_model_columns(self._generate_synthetic_features(sequence_length)[0], out[0])
+        return out
+
+    def _copy_model_columns(self, built: np.ndarray, out: np.ndarray):
+        """Copy the built (sequence_length, BUILT_FEATURE_COUNT) features the model takes into out"""
+        if self._model_columns is None:
+            out[:] = built
+        else:
+            np.take(built, self._model_columns, axis=1, out=out)
 
     def _generate_synthetic_features(self, sequence_length: int) -> np.ndarray:
         """Generate synthetic features when real data is unavailable"""
@@ -228,60 +441,51 @@ class EnhancedVolatilityPredictor:
         base_price = 4000.0  # Base ETH price
         volatility = 0.15
 
-        features = []
-        current_price = base_price
-
-        for i in range(sequence_length):
-            # Random walk with volatility
-            price_change = np.random.normal(0, volatility * current_price * 0.01)
-            current_price = max(current_price + price_change, 100)  # Minimum price
-
-            feature_vector = [
-                np.log(current_price),
-                0.001,  # Confidence ratio
-                i / sequence_length,  # Time position
-                price_change / current_price if i > 0 else 0,  # Return
-                volatility  # Volatility
-            ]
-            features.append(feature_vector)
-
-        feature_array = np.array(features, dtype=np.float32)
-        return feature_array.reshape(1, sequence_length, self.feature_count)
+        # Random walk whose step scale is proportional to the current price:
+        # price[i] = price[i-1] * (1 + volatility * 0.01 * z[i])
+        step_returns = self._rng.normal(0.0, volatility * 0.01, sequence_length)
+        prices = np.maximum(base_price * np.cumprod(1.0 + step_returns), 100.0)  # Minimum price
+        changes = np.diff(prices, prepend=base_price)
+
+        features = np.empty((sequence_length, BUILT_FEATURE_COUNT), dtype=np.float32)
+        features[:, 0] = np.log(prices)
+        features[:, 1] = 0.001  # Confidence ratio
+        features[:, 2] = np.arange(sequence_length) / sequence_length  # Time position
+        features[0, 3] = 0.0
+        features[1:, 3] = changes[1:] / prices[1:]  # Return
+        features[:, 4] = volatility  # Volatility
+        return features[None]
+
+    def cached_volatility_lstm(self, symbol: str) -> Optional[Tuple[float, Dict]]:
+        """LSTM prediction for symbol if still current (no tick since it was made), else None"""
+        if self._runner is None:
+            return None
+        return self._get_tick_cached(('lstm', symbol), symbol)
 
     def predict_volatility_lstm(self, symbol: str = 'ETH/USD') -> Tuple[float, Dict]:
         """Predict volatility using LSTM model with real price data"""
         try:
-            # Prepare input features
-            input_features = self.prepare_lstm_features(symbol, self.sequence_length)
-
-            if input_features is None:
-                return 0.15, {'method': 'fallback', 'confidence': 'low'}
-
             # Run LSTM inference
-            if self.session is not None:
-                input_name = self.session.get_inputs()[0].name
-                result = self.session.run(None, {input_name: input_features})
-
-                # Extract predicted volatility
-                predicted_vol = float(result[0][0][0])
+            if self._runner is not None:
+                # Same ticks give the same forward pass; skip it until new data arrives
+                cache_key = ('lstm', symbol)
+                cached = self._get_tick_cached(cache_key, symbol)
+                if cached is not None:
+                    return cached
 
-                # Ensure reasonable bounds
-                predicted_vol = max(0.005, min(predicted_vol, 1.0))
+                with self._inference_lock:
+                    # Prepare input features directly in the bound input buffer
+                    input_features = self.prepare_lstm_features(
+                        symbol, self.sequence_length, out=self._runner.input_buffer[:1]
+                    )
 
-                # Calculate confidence based on data quality
-                data_points = len(self.price_history.get(symbol, []))
-                confidence = 'high' if data_points > 100 else 'medium' if data_points > 20 else 'low'
+                    if input_features is None:
+                        return 0.15, {'method': 'fallback', 'confidence': 'low'}
 
-                metadata = {
-                    'method': 'lstm_with_real_data',
-                    'confidence': confidence,
-                    'data_points': data_points,
-                    'symbol': symbol,
-                    'model_input_shape': input_features.shape
-                }
+                    # Extract predicted volatility
+                    predicted_vol = float(self._runner.run(1)[0])
 
-                logger.info(f"🎯 LSTM predicted volatility for {symbol}: {predicted_vol:.4f} (confidence: {confidence})")
-                return predicted_vol, metadata
+                return self._finish_lstm_prediction(symbol, predicted_vol, input_features.shape)
 
             else:
                 # Fallback to historical calculation
@@ -297,6 +501,68 @@ class EnhancedVolatilityPredictor:
             logger.error(f"❌ LSTM volatility prediction failed for {symbol}: {e}")
             return 0.15, {'method': 'error_fallback', 'confidence': 'low', 'error': str(e)}
 
+    def predict_volatility_batch(self, symbols: Optional[List[str]] = None) -> Dict[str, Tuple[float, Dict]]:
+        """Predict volatility for several symbols, scoring all stale ones in a single batched LSTM run"""
+        symbols = list(self.pyth_feeds) if symbols is None else list(symbols)
+        if self._runner is None:
+            return {symbol: self.predict_volatility_lstm(symbol) for symbol in symbols}
+
+        results = {}
+        pending = []
+        for symbol in symbols:
+            cached = self._get_tick_cached(('lstm', symbol), symbol)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                pending.append(symbol)
+
+        # One session run per max_batch symbols (a single run for dynamic-batch exports)
+        max_batch = self._runner.max_batch
+        for start in range(0, len(pending), max_batch):
+            chunk = pending[start:start + max_batch]
+            try:
+                with self._inference_lock:
+                    for row, symbol in enumerate(chunk):
+                        self.prepare_lstm_features(
+                            symbol, self.sequence_length, out=self._runner.input_buffer[row:row + 1]
+                        )
+                    predictions = self._runner.run(len(chunk)).tolist()
+                input_shape = (1, self.sequence_length, self.feature_count)
+                for symbol, predicted_vol in zip(chunk, predictions):
+                    results[symbol] = self._finish_lstm_prediction(symbol, predicted_vol, input_shape)
+
+            except Exception as e:
+                logger.error(f"❌ Batched LSTM volatility prediction failed for {', '.join(chunk)}: {e}")
+                for symbol in chunk:
+                    results[symbol] = (0.15, {'method': 'error_fallback', 'confidence': 'low', 'error': str(e)})
+
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def _finish_lstm_prediction(self, symbol: str, predicted_vol: float, input_shape: Tuple) -> Tuple[float, Dict]:
+        """Bound a raw LSTM output, attach metadata and cache it until the next tick"""
+        # Ensure reasonable bounds
+        predicted_vol = max(0.005, min(predicted_vol, 1.0))
+
+        # Calculate confidence based on data quality
+        data_points = self._history_length(symbol)
+        confidence = 'high' if data_points > 100 else 'medium' if data_points > 20 else 'low'
+
+        metadata = {
+            'method': 'lstm_with_real_data',
+            'confidence': confidence,
+            'data_points': data_points,
+            'symbol': symbol,
+            'model_input_shape': input_shape,
+            'model_precision': self.model_precision
+        }
+
+        # Below a full window the input is synthetic noise, so the result is not a function of the ticks
+        if data_points >= self.sequence_length:
+            self._set_tick_cached(('lstm', symbol), symbol, (predicted_vol, metadata))
+
+        logger.info("🎯 LSTM predicted volatility for %s: %.4f (confidence: %s)", symbol, predicted_vol, confidence)
+        return predicted_vol, metadata
+
     def calculate_lambda_coefficient(self, volatility: float, base_rate: float = 0.05) -> float:
         """Calculate lambda coefficient for lending risk assessment"""
         try:
@@ -321,69 +587,88 @@ class EnhancedVolatilityPredictor:
         try:
             # Get LSTM prediction
             lstm_volatility, lstm_metadata = self.predict_volatility_lstm(symbol)
-
-            # Get historical volatility for comparison
-            historical_volatility = self.calculate_historical_volatility(symbol)
-
-            # Calculate lambda coefficient
-            lambda_value = self.calculate_lambda_coefficient(lstm_volatility)
-
-            # Get current price
-            current_price = None
-            if symbol in self.price_history and self.price_history[symbol]:
-                current_price = self.price_history[symbol][-1]['price']
-
-            summary = {
-                'symbol': symbol,
-                'current_price': current_price,
-                'lstm_volatility': lstm_volatility,
-                'historical_volatility': historical_volatility,
-                'lambda_coefficient': lambda_value,
-                'lambda1000': int(lambda_value * 1000),
-                'confidence': lstm_metadata['confidence'],
-                'prediction_method': lstm_metadata['method'],
-                'data_points': len(self.price_history.get(symbol, [])),
-                'last_update': datetime.now().isoformat(),
-                'risk_assessment': self._assess_risk_level(lstm_volatility),
-                'metadata': lstm_metadata
-            }
-
-            return summary
+            return self._build_prediction_summary(symbol, lstm_volatility, lstm_metadata)
 
         except Exception as e:
             logger.error(f"❌ Prediction summary failed for {symbol}: {e}")
-            return {
-                'symbol': symbol,
-                'error': str(e),
-                'lambda_coefficient': 1.2,
-                'lstm_volatility': 0.15,
-                'confidence': 'low'
-            }
-
-    def _assess_risk_level(self, volatility: float) -> str:
-        """Assess risk level based on volatility"""
-        if volatility < 0.1:
-            return 'LOW'
-        elif volatility < 0.25:
-            return 'MEDIUM'
-        elif volatility < 0.5:
-            return 'HIGH'
-        else:
-            return 'EXTREME'
+            return self._error_summary(symbol, e)
+
+    def get_prediction_summaries(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Prediction summaries for several symbols, backed by one batched LSTM run"""
+        symbols = list(self.pyth_feeds) if symbols is None else list(symbols)
+        summaries = {}
+        for symbol, (lstm_volatility, lstm_metadata) in self.predict_volatility_batch(symbols).items():
+            try:
+                summaries[symbol] = self._build_prediction_summary(symbol, lstm_volatility, lstm_metadata)
+            except Exception as e:
+                logger.error(f"❌ Prediction summary failed for {symbol}: {e}")
+                summaries[symbol] = self._error_summary(symbol, e)
+        return summaries
+
+    def _build_prediction_summary(self, symbol: str, lstm_volatility: float, lstm_metadata: Dict) -> Dict:
+        """Combine an LSTM prediction with historical volatility, lambda and risk level"""
+        # Get historical volatility for comparison
+        historical_volatility = self.calculate_historical_volatility(symbol)
+
+        # Calculate lambda coefficient
+        lambda_value = self.calculate_lambda_coefficient(lstm_volatility)
+
+        # Get current price
+        current_price = None
+        if self._history_length(symbol) > 0:
+            current_price = float(self._history_tail(symbol, 1)[0, PRICE])
+
+        summary = {
+            'symbol': symbol,
+            'current_price': current_price,
+            'lstm_volatility': lstm_volatility,
+            'historical_volatility': historical_volatility,
+            'lambda_coefficient': lambda_value,
+            'lambda1000': int(lambda_value * 1000),
+            'confidence': lstm_metadata['confidence'],
+            'prediction_method': lstm_metadata['method'],
+            'data_points': self._history_length(symbol),
+            'last_update': datetime.now().isoformat(),
+            'risk_assessment': self._assess_risk_level(lstm_volatility),
+            'metadata': lstm_metadata
+        }
+
+        return summary
+
+    def _error_summary(self, symbol: str, error: Exception) -> Dict:
+        """Conservative summary returned when a prediction cannot be produced"""
+        return {
+            'symbol': symbol,
+            'error': str(error),
+            'lambda_coefficient': 1.2,
+            'lstm_volatility': 0.15,
+            'confidence': 'low'
+        }
+
+    def _assess_risk_level(self, volatility):
+        """Assess risk level based on volatility (a scalar, or an array of volatilities)"""
+        # side='right' keeps the boundaries in the upper band, e.g. exactly 0.1 is MEDIUM
+        band = np.searchsorted(RISK_THRESHOLDS, volatility, side='right')
+        if np.ndim(band):
+            return RISK_LABELS[band]
+        return RISK_LABELS[band].item()
 
     def get_price_history_summary(self) -> Dict:
         """Get summary of collected price data"""
         summary = {}
-        for symbol, prices in self.price_history.items():
-            if prices:
-                latest = prices[-1]
+        for symbol, buffer in self.price_history.items():
+            length = self._history_length(symbol)
+            if length:
+                # min/max don't care about ring order, so scan the filled slots in place
+                price_column = buffer[:length, PRICE]
+                latest = buffer[(self._count[symbol] - 1) % self.max_history]
                 summary[symbol] = {
-                    'count': len(prices),
-                    'latest_price': latest['price'],
-                    'latest_timestamp': latest['datetime'].isoformat(),
+                    'count': length,
+                    'latest_price': float(latest[PRICE]),
+                    'latest_timestamp': datetime.fromtimestamp(latest[TIMESTAMP]).isoformat(),
                     'price_range': {
-                        'min': min(p['price'] for p in prices),
-                        'max': max(p['price'] for p in prices)
+                        'min': float(price_column.min()),
+                        'max': float(price_column.max())
                     }
                 }
             else:
@@ -5,7 +5,6 @@ Provides REST API for real-time volatility analysis and lambda calculation
 
 import os
 import json
-import pickle
 import numpy as np
 import onnxruntime as ort
 from flask import Flask, request, jsonify
@@ -13,36 +12,116 @@ from flask_cors import CORS
 import logging
 import time
 from datetime import datetime
-import requests
-import websocket
 import threading
-import asyncio
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; prepare_input_data falls back to NumPy
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # Optional; the stdlib parser accepts the same str/bytes payloads
+    _json_loads = json.loads
 
 # Import enhanced AI system
-from enhanced_ai import EnhancedVolatilityPredictor
+from enhanced_ai import EnhancedVolatilityPredictor, PRICE, CONFIDENCE, TIMESTAMP, HISTORY_COLUMNS
+from config import config, select_model_variant
+from ort_batch import (BatchedVolatilityRunner, MicroBatcher, StreamingStepRunner, make_session_options,
+                       model_feature_count)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _fill_model_input_loop(vol, out):
+    """Write the last seq_length values of vol (mean-padded on the left) across every feature of out[0]"""
+    seq_length = out.shape[1]
+    features = out.shape[2]
+    n = vol.shape[0]
+    pad = seq_length - n if n < seq_length else 0
+    offset = n - seq_length if n > seq_length else 0
+
+    fill = np.float32(0.1)
+    if pad and n:
+        total = 0.0
+        for i in range(n):
+            total += vol[i]
+        fill = np.float32(total / n)
+
+    for i in range(seq_length):
+        value = fill if i < pad else vol[offset + i - pad]
+        for j in range(features):
+            out[0, i, j] = value
+
+
+def _fill_model_input_numpy(vol, out):
+    """Vectorized equivalent of _fill_model_input_loop"""
+    seq_length = out.shape[1]
+    vol = vol[-seq_length:]
+    pad = seq_length - vol.size
+    if pad:
+        out[0, :pad] = vol.mean(dtype=np.float64) if vol.size else 0.1
+    out[0, pad:] = vol[:, None]
+
+
+# Compiled for the float32 buffers at import, so the first request pays no JIT cost
+_fill_model_input = (
+    njit('void(float32[::1], float32[:, :, ::1])', cache=True)(_fill_model_input_loop)
+    if NUMBA_AVAILABLE else _fill_model_input_numpy
+)
+
+
+_iso_cache = (None, '')  # (unix second, its isoformat()); swapped as one tuple so threads never mix them
+
+
+def iso_now():
+    """datetime.now().isoformat(), reformatting the date/time part only once per second"""
+    global _iso_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_cache = (second, prefix)
+    microsecond = int((now - second) * 1_000_000)
+    return f"{prefix}.{microsecond:06d}" if microsecond else prefix
+
+
 app = Flask(__name__)
 CORS(app)
 
 
 class VolatilityInferenceService:
+    ANNUALIZATION_FACTOR = np.sqrt(24 * 365)  # Hourly returns -> annual volatility
+    PRICE_HISTORY_SIZE = 168  # 1 week of hourly prices
+
     def __init__(self):
         self.model_path = 'model/lstm_vol.onnx'
+        self.model_precision = 'fp32'
+        self.step_model_path = 'model/lstm_vol_step.onnx'  # Single-step export for streaming (quick_model)
         self.model_info_path = 'model/model_info.json'
-        self.scaler_path = 'model/scaler.pkl'
 
         self.session = None
+        self._batcher = None  # Micro-batches concurrent legacy-path requests into shared session runs
+        self._symbol_batcher = None  # Coalesces concurrent /infer symbol predictions into batched predictor runs
+        self.step_runner = None  # Stateful one-tick-at-a-time runner, if a step model was exported
+        self._inference_lock = threading.Lock()
         self.model_info = None
-        self.scaler = None
+        self._zero_input = None  # Read-only fallback model input, sized once model_info is known
+        self._fallback_warned = False
         self.enhanced_predictor = None
 
-        # Real-time data storage
-        self.price_history = []
-        self.volatility_cache = {}
+        # Real-time data storage: ring buffer with price/confidence/timestamp columns
+        # (same layout as EnhancedVolatilityPredictor) plus the number of prices written
+        self.price_history = np.empty((self.PRICE_HISTORY_SIZE, HISTORY_COLUMNS), dtype=np.float64)
+        self._price_count = 0
+        self.volatility_cache = {}  # price_window -> (price count when computed, volatility)
 
         # Pyth WebSocket connection for real crypto price feeds
         self.ws = None
@@ -53,6 +132,16 @@ class VolatilityInferenceService:
             'SOL/USD': '0xef0d8b6fda2ceba41da15d4095d1da392a0d2f8ed0c6c7bc0f4cfac8c280b56d'  # Real SOL/USD feed
         }
 
+        # Subscription message for the price WebSocket, encoded once rather than on every (re)connect
+        self._subscription_payload = json.dumps({
+            "jsonrpc": "2.0",
+            "method": "subscribe",
+            "params": {
+                "ids": list(self.pyth_feeds.values())
+            },
+            "id": 1
+        })
+
         # Hermes client for real price data
         self.hermes_endpoint = 'https://hermes.pyth.network'
 
@@ -63,6 +152,12 @@ class VolatilityInferenceService:
             'UPDATE_INTERVAL': int(os.getenv('UPDATE_INTERVAL', '60')),  # seconds
             'MAX_PRICE_AGE': int(os.getenv('MAX_PRICE_AGE', '300')),     # 5 minutes
             'VOLATILITY_WINDOW': int(os.getenv('VOLATILITY_WINDOW', '24')),  # hours
+            'SEQUENCE_LENGTH': 24,  # LSTM input window, fixed in the ORT session
+            'ORT_INTRA_OP_THREADS': int(os.getenv('ORT_INTRA_OP_THREADS', '1')),  # Small LSTM: fan-out costs more than it saves
+            'ORT_INTER_OP_THREADS': int(os.getenv('ORT_INTER_OP_THREADS', '1')),
+            'PRICE_MONITOR_CPU': int(os.getenv('PRICE_MONITOR_CPU', '0')),  # -1 disables pinning
+            'INFER_MAX_BATCH': int(os.getenv('INFER_MAX_BATCH', '16')),  # Requests coalesced per ORT run
+            'INFER_BATCH_WINDOW_MS': float(os.getenv('INFER_BATCH_WINDOW_MS', '2')),  # Wait for more requests
             'PORT': int(os.getenv('PORT', '5001')),
             'DEBUG': os.getenv('DEBUG', 'false').lower() == 'true'
         }
@@ -74,9 +169,10 @@ class VolatilityInferenceService:
     def load_model(self):
         """Load ONNX model and preprocessing components"""
         try:
-            # Load ONNX model
+            # Load ONNX model (quantized variant when available)
+            self.model_path, self.model_precision = select_model_variant(config.QUANT_MODE)
             if os.path.exists(self.model_path):
-                self.session = ort.InferenceSession(self.model_path)
+                self.session = self.create_session()
                 logger.info(f"✅ ONNX model loaded: {self.model_path}")
             else:
                 logger.warning(f"⚠️ Model not found: {self.model_path} - Using fallback mode")
@@ -96,14 +192,47 @@ class VolatilityInferenceService:
                     'output_shape': [1, 1]
                 }
 
-            # Load scaler if available
-            if os.path.exists(self.scaler_path):
-                with open(self.scaler_path, 'rb') as f:
-                    self.scaler = pickle.load(f)
-                logger.info("✅ Feature scaler loaded")
+            # The graph is authoritative for the per-step feature count (create_lstm_model.py's
+            # export takes 4 features and generates the time feature itself)
+            if self.session is not None:
+                features = model_feature_count(self.session, self.model_info['features'])
+                if features != self.model_info['features']:
+                    logger.warning(f"⚠️ Model info lists {self.model_info['features']} features, model takes {features}")
+                    seq_length = self.model_info['sequence_length']
+                    self.model_info = dict(self.model_info, features=features, input_shape=[1, seq_length, features])
+
+            self._zero_input = np.zeros(
+                (1, self.model_info['sequence_length'], self.model_info['features']), dtype=np.float32
+            )
+            self._zero_input.setflags(write=False)
+
+            # Bind persistent input/output buffers once and warm up the kernels before traffic
+            if self.session is not None:
+                # Fixed-batch exports (quick_model's [1, 24, 5]) can't be batched across requests
+                batch_dim = self.session.get_inputs()[0].shape[0]
+                runner = BatchedVolatilityRunner(
+                    self.session,
+                    max_batch=batch_dim if isinstance(batch_dim, int) else self.config['INFER_MAX_BATCH'],
+                    sequence_length=self.model_info['sequence_length'],
+                    features=self.model_info['features']
+                )
+                runner.run(1)
+                self._batcher = MicroBatcher(
+                    lambda sequences: runner.predict(sequences).tolist(), runner.max_batch,
+                    max_wait_ms=self.config['INFER_BATCH_WINDOW_MS'], name='ort-micro-batcher'
+                )
+
+            # Streaming step model: carries LSTM state so each new observation costs one step
+            if os.path.exists(self.step_model_path):
+                self.step_runner = StreamingStepRunner(self.create_session(self.step_model_path))
+                logger.info(f"✅ Streaming step model loaded: {self.step_model_path}")
 
             # Initialize enhanced AI volatility predictor
-            self.enhanced_predictor = EnhancedVolatilityPredictor(self.session)
+            self.enhanced_predictor = EnhancedVolatilityPredictor(self.session, model_precision=self.model_precision)
+            self._symbol_batcher = MicroBatcher(
+                self._predict_symbols, self.config['INFER_MAX_BATCH'],
+                max_wait_ms=self.config['INFER_BATCH_WINDOW_MS'], name='symbol-micro-batcher'
+            )
             logger.info("🧠 Enhanced AI volatility predictor initialized")
 
             return True
@@ -112,6 +241,42 @@ class VolatilityInferenceService:
             logger.error(f"❌ Model loading failed: {e}")
             return False
 
+    def create_session(self, model_path=None):
+        """Create the ONNX Runtime session, reusing the cached optimized graph when fresh"""
+        model_path = model_path or self.model_path
+        # ENABLE_ALL output is specific to the ORT build and host that wrote it, so a sidecar from
+        # another ORT version is never picked up
+        optimized_path = f"{os.path.splitext(model_path)[0]}.optimized.{ort.__version__}.ort"
+        if model_path == config.MODEL_PATH and config.ORT_OPTIMIZED_MODEL_PATH:
+            optimized_path = config.ORT_OPTIMIZED_MODEL_PATH
+        providers = config.ort_providers()
+        # Nodes compiled by TensorRT/CUDA can't be serialized, so only CPU sessions use the sidecar
+        cache_graph = config.ORT_EXECUTION_PROVIDER == 'CPUExecutionProvider'
+
+        sess_options = make_session_options(
+            self.config['SEQUENCE_LENGTH'],
+            self.config['ORT_INTRA_OP_THREADS'],
+            self.config['ORT_INTER_OP_THREADS']
+        )
+
+        if cache_graph and os.path.exists(optimized_path) and os.path.getmtime(optimized_path) >= os.path.getmtime(model_path):
+            # Graph was optimized on a previous start; skip the optimizer pass
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            try:
+                session = ort.InferenceSession(optimized_path, sess_options, providers=providers)
+                logger.info(f"⚡ Using cached optimized graph: {optimized_path}")
+                return session
+            except Exception as e:
+                # Stale or foreign sidecar: rebuild it from the source model rather than serve no model
+                logger.warning(f"⚠️ Cached optimized graph unusable, re-optimizing {model_path}: {e}")
+
+        # First start (model changed, or cache unusable): optimize once and write the ORT-format sidecar
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if cache_graph:
+            os.makedirs(os.path.dirname(optimized_path) or '.', exist_ok=True)
+            sess_options.optimized_model_filepath = optimized_path
+        return ort.InferenceSession(model_path, sess_options, providers=providers)
+
     def start_enhanced_predictor(self):
         """Start enhanced AI predictor with real-time price collection"""
         try:
@@ -125,25 +290,20 @@ class VolatilityInferenceService:
         """Start real-time price monitoring from Pyth"""
         def monitor():
             try:
-                # Connect to Pyth Hermes WebSocket
+                # Keep socket IO on its own core, away from the cores running inference
+                self.pin_current_thread(self.config['PRICE_MONITOR_CPU'])
+
+                # Connect to Pyth Hermes WebSocket (client imported only once monitoring starts)
+                import websocket
                 ws_url = "wss://hermes.pyth.network/ws"
                 self.ws = websocket.WebSocketApp(
                     ws_url,
+                    on_open=self.on_price_open,
                     on_message=self.on_price_message,
                     on_error=self.on_price_error,
                     on_close=self.on_price_close
                 )
 
-                # Subscribe to SHIB/USD feed
-                subscription = {
-                    "jsonrpc": "2.0",
-                    "method": "subscribe",
-                    "params": {
-                        "ids": list(self.pyth_feeds.values())
-                    },
-                    "id": 1
-                }
-
                 logger.info("🔗 Connecting to Pyth WebSocket...")
                 self.ws.run_forever()
 
@@ -154,28 +314,33 @@ class VolatilityInferenceService:
         thread = threading.Thread(target=monitor, daemon=True)
         thread.start()
 
+    @staticmethod
+    def pin_current_thread(cpu):
+        """Pin the calling thread to one CPU (Linux only; no-op when cpu < 0 or only one CPU is usable)"""
+        if cpu < 0 or not hasattr(os, 'sched_setaffinity'):
+            return
+        available = os.sched_getaffinity(0)
+        if len(available) > 1 and cpu in available:
+            os.sched_setaffinity(0, {cpu})  # pid 0 = calling thread
+            logger.info(f"📌 Price monitor pinned to CPU {cpu}")
+
+    def on_price_open(self, ws):
+        """Subscribe to the configured feeds once the WebSocket is connected"""
+        ws.send(self._subscription_payload)
+
     def on_price_message(self, ws, message):
         """Handle incoming price data from Pyth"""
         try:
-            data = json.loads(message)
+            price_data = _json_loads(message).get('result')
 
-            if 'result' in data and 'price' in data['result']:
-                price_data = data['result']
+            if price_data is not None and 'price' in price_data:
                 price = float(price_data['price']) * (10 ** price_data['expo'])
                 timestamp = time.time()
 
-                # Store price history
-                self.price_history.append({
-                    'price': price,
-                    'timestamp': timestamp,
-                    'confidence': price_data.get('conf', 0)
-                })
+                # Store price history (oldest entry is overwritten after 1 week)
+                self.record_price(price, float(price_data.get('conf', 0)), timestamp)
 
-                # Keep only last 168 hours (1 week)
-                if len(self.price_history) > 168:
-                    self.price_history = self.price_history[-168:]
-
-                logger.info(f"📈 Price update: ${price:.8f}")
+                logger.info("📈 Price update: $%.8f", price)
 
         except Exception as e:
             logger.error(f"❌ Price message handling failed: {e}")
@@ -192,51 +357,49 @@ class VolatilityInferenceService:
         """Prepare input data for model inference"""
         try:
             # Convert to numpy array
-            vol_array = np.array(volatility_sequence, dtype=np.float32)
+            vol_array = np.ascontiguousarray(np.ravel(volatility_sequence), dtype=np.float32)
 
             # Ensure we have the right sequence length
             seq_length = self.model_info['sequence_length']
             features = self.model_info['features']
 
-            if len(vol_array) < seq_length:
-                # Pad with mean if not enough data
-                mean_vol = np.mean(vol_array) if len(vol_array) > 0 else 0.1
-                padding = np.full(seq_length - len(vol_array), mean_vol)
-                vol_array = np.concatenate([padding, vol_array])
-            elif len(vol_array) > seq_length:
-                # Take the last seq_length values
-                vol_array = vol_array[-seq_length:]
-
             # Create feature matrix (replicate volatility for demo)
             # In production, would use actual features (price, volume, etc.)
-            feature_matrix = np.zeros((seq_length, features))
-            for i in range(features):
-                feature_matrix[:, i] = vol_array
-
-            # Reshape for model input [1, seq_length, features]
-            model_input = feature_matrix.reshape(1, seq_length, features)
+            # Last seq_length values, mean-padded if short, written into [1, seq_length, features]
+            model_input = np.empty((1, seq_length, features), dtype=np.float32)
+            _fill_model_input(vol_array, model_input)
 
-            return model_input.astype(np.float32)
+            return model_input
 
         except Exception as e:
-            logger.error(f"❌ Input preparation failed: {e}")
-            # Return default input
-            seq_length = self.model_info['sequence_length']
-            features = self.model_info['features']
-            return np.random.random((1, seq_length, features)).astype(np.float32)
+            # Neutral all-zero input instead of random noise; warn once rather than on every bad request
+            if not self._fallback_warned:
+                logger.warning(f"⚠️ Input preparation failed, using zero input (further failures not logged): {e}")
+                self._fallback_warned = True
+            return self._zero_input
+
+    def _predict_symbols(self, symbols):
+        """Score a batch of symbol requests with one predictor call (duplicates scored once)"""
+        results = self.enhanced_predictor.predict_volatility_batch(list(dict.fromkeys(symbols)))
+        return [results[symbol] for symbol in symbols]
+
+    def predict_symbol_volatility(self, symbol):
+        """LSTM volatility for symbol, batched with concurrent requests unless already cached for this tick"""
+        cached = self.enhanced_predictor.cached_volatility_lstm(symbol)
+        if cached is not None:
+            return cached
+        if self._symbol_batcher is None:
+            return self.enhanced_predictor.predict_volatility_lstm(symbol)
+        return self._symbol_batcher.submit(symbol)
 
     def predict_volatility(self, input_data):
         """Predict volatility using ONNX model or fallback calculation"""
         try:
-            if self.session is not None:
-                # Get input name
-                input_name = self.session.get_inputs()[0].name
-
-                # Run inference
-                result = self.session.run(None, {input_name: input_data})
-
-                # Extract predicted volatility
-                predicted_vol = float(result[0][0][0])
+            if self._batcher is not None:
+                # Scored on the batcher's bound buffer, together with any concurrent requests.
+                # Only the batcher thread touches that buffer, so request threads need no buffer pool
+                # or lock: each hands over its own prepared input and blocks on the result.
+                predicted_vol = self._batcher.submit(input_data[0])
 
                 # Ensure volatility is in reasonable range
                 predicted_vol = max(0.01, min(predicted_vol, 1.0))
@@ -257,6 +420,24 @@ class VolatilityInferenceService:
             # Return default volatility
             return 0.15
 
+    def predict_volatility_step(self, volatility, reset=False):
+        """Feed one volatility observation to the streaming LSTM and return its prediction (None if unavailable)
+
+        Unlike predict_volatility, state persists across calls instead of re-running a 24-step window.
+        """
+        if self.step_runner is None:
+            return None
+
+        with self._inference_lock:
+            if reset:
+                self.step_runner.reset()
+            # Same feature construction as prepare_input_data: the value replicated across features
+            self.step_runner.input_buffer[0] = volatility
+            predicted_vol = self.step_runner.step()
+
+        # Ensure volatility is in reasonable range
+        return max(0.01, min(predicted_vol, 1.0))
+
     def calculate_lambda(self, volatility):
         """
         Calculate risk multiplier (lambda) based on SHIB volatility
@@ -287,7 +468,7 @@ class VolatilityInferenceService:
             # Ensure lambda is in valid range
             lambda_value = max(min_lambda, min(lambda_value, max_lambda))
 
-            logger.info(f"🐕 SHIB Lambda: vol={volatility:.3f} → λ={lambda_value:.3f}")
+            logger.info("🐕 SHIB Lambda: vol=%.3f → λ=%.3f", volatility, lambda_value)
             return lambda_value
 
         except Exception as e:
@@ -296,6 +477,9 @@ class VolatilityInferenceService:
 
     def fetch_real_price_data(self, symbol='SHIB/USD'):
         """Fetch real price data from Pyth Network Hermes API"""
+        # Only this legacy endpoint needs requests; import it on first use
+        import requests
+
         try:
             feed_id = self.pyth_feeds.get(symbol)
             if not feed_id:
@@ -329,15 +513,7 @@ class VolatilityInferenceService:
             timestamp = price_info['publish_time']
 
             # Store price for volatility calculation
-            self.price_history.append({
-                'price': price,
-                'timestamp': timestamp,
-                'symbol': symbol
-            })
-
-            # Keep only last 100 prices
-            if len(self.price_history) > 100:
-                self.price_history.pop(0)
+            self.record_price(price, confidence, timestamp)
 
             logger.info(f"✅ {symbol} price: ${price:.8f} (±{confidence:.8f})")
 
@@ -359,34 +535,61 @@ class VolatilityInferenceService:
             logger.error(f"❌ Error fetching {symbol} price: {e}")
             return None
 
+    def record_price(self, price, confidence, timestamp):
+        """Append a price to the ring buffer, overwriting the oldest once full"""
+        self.price_history[self._price_count % self.PRICE_HISTORY_SIZE] = (price, confidence, timestamp)
+        self._price_count += 1
+
+    def price_history_length(self):
+        """Number of prices currently held"""
+        return min(self._price_count, self.PRICE_HISTORY_SIZE)
+
+    def recent_prices(self, n=None):
+        """Last n rows (all if None) in chronological order; a view unless the window wraps"""
+        length = self.price_history_length()
+        n = length if n is None else max(0, min(n, length))
+        end = (self._price_count - 1) % self.PRICE_HISTORY_SIZE + 1 if length else 0
+        start = end - n
+        if start >= 0:
+            return self.price_history[start:end]
+        return np.concatenate((self.price_history[start:], self.price_history[:end]))
+
+    def recent_price_records(self, n=None):
+        """Last n prices as JSON-ready dicts, built only when a response needs them"""
+        return [
+            {'price': float(row[PRICE]), 'confidence': float(row[CONFIDENCE]), 'timestamp': float(row[TIMESTAMP])}
+            for row in self.recent_prices(n)
+        ]
+
     def calculate_volatility_from_prices(self, price_window=24):
         """Calculate volatility from recent price history"""
         try:
-            if len(self.price_history) < 2:
+            if self.price_history_length() < 2:
                 return 0.15  # Default volatility
 
+            # Reuse the last result until a new price is recorded
+            cached = self.volatility_cache.get(price_window)
+            if cached is not None and cached[0] == self._price_count:
+                return cached[1]
+
             # Get recent prices
-            recent_prices = [p['price'] for p in self.price_history[-price_window:]]
+            recent_prices = self.recent_prices(price_window)[:, PRICE]
 
-            if len(recent_prices) < 2:
+            # Need at least two returns
+            if recent_prices.size < 3:
                 return 0.15
 
             # Calculate returns
-            returns = []
-            for i in range(1, len(recent_prices)):
-                ret = (recent_prices[i] - recent_prices[i-1]) / recent_prices[i-1]
-                returns.append(ret)
-
-            if len(returns) < 2:
-                return 0.15
+            returns = np.diff(recent_prices) / recent_prices[:-1]
 
             # Calculate volatility as standard deviation of returns
             volatility = np.std(returns)
 
             # Annualize volatility (assuming hourly data)
-            annualized_vol = volatility * np.sqrt(24 * 365)
+            annualized_vol = float(volatility * self.ANNUALIZATION_FACTOR)
 
-            return float(annualized_vol)
+            self.volatility_cache[price_window] = (self._price_count, annualized_vol)
+            return annualized_vol
 
         except Exception as e:
             logger.error(f"❌ Volatility calculation failed: {e}")
@@ -402,9 +605,9 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_now(),
         'model_loaded': inference_service.session is not None,
-        'price_history_length': len(inference_service.price_history)
+        'price_history_length': inference_service.price_history_length()
     })
 
 
@@ -415,7 +618,7 @@ def infer_volatility():
     Accepts volatility sequence and returns risk multiplier (lambda)
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         if request.method == 'GET':
             # Get volatility from query parameters
@@ -436,7 +639,7 @@ def infer_volatility():
 
         if inference_service.enhanced_predictor:
             # Get enhanced prediction with real price data
-            predicted_volatility, metadata = inference_service.enhanced_predictor.predict_volatility_lstm(symbol)
+            predicted_volatility, metadata = inference_service.predict_symbol_volatility(symbol)
             lambda_value = inference_service.enhanced_predictor.calculate_lambda_coefficient(predicted_volatility)
         else:
             # Fallback to legacy method
@@ -452,22 +655,22 @@ def infer_volatility():
         lambda_1000 = int(lambda_value * 1000)
 
         # Calculate processing time
-        processing_time = time.time() - start_time
+        processing_time_ns = time.perf_counter_ns() - start_time
 
         result = {
             'lambda1000': lambda_1000,
             'lambda': lambda_value,
             'predicted_volatility': predicted_volatility,
             'input_volatility': volatility_sequence[-1] if volatility_sequence else None,
-            'processing_time_ms': round(processing_time * 1000, 2),
-            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': processing_time_ns // 10_000 / 100,
+            'timestamp': iso_now(),
             'model_info': {
                 'sequence_length': inference_service.model_info['sequence_length'],
                 'features': inference_service.model_info['features']
             }
         }
 
-        logger.info(f"🎯 Inference: vol={predicted_volatility:.4f}, λ={lambda_value:.3f}")
+        logger.info("🎯 Inference: vol=%.4f, λ=%.3f", predicted_volatility, lambda_value)
 
         return jsonify(result)
 
@@ -477,7 +680,7 @@ def infer_volatility():
             'error': str(e),
             'lambda1000': 1000,  # Safe default
             'lambda': 1.0,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }), 500
 
 
@@ -502,7 +705,7 @@ def get_real_price(symbol):
             return jsonify({
                 'error': f'Failed to fetch price data for {symbol}',
                 'symbol': symbol,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': iso_now()
             }), 500
 
         # Calculate volatility from real price history
@@ -530,9 +733,47 @@ def get_real_price(symbol):
         return jsonify({
             'error': str(e),
             'symbol': symbol,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }), 500
 
+@app.route('/infer/stream', methods=['GET', 'POST'])
+def infer_volatility_stream():
+    """
+    Streaming inference endpoint
+    Feeds one new volatility observation to the stateful LSTM and returns the updated lambda
+    """
+    try:
+        if request.method == 'GET':
+            volatility = float(request.args.get('volatility', inference_service.calculate_volatility_from_prices()))
+            reset = request.args.get('reset', 'false').lower() == 'true'
+        else:  # POST
+            data = request.get_json() or {}
+            volatility = float(data.get('volatility', inference_service.calculate_volatility_from_prices()))
+            reset = bool(data.get('reset', False))
+
+        predicted_volatility = inference_service.predict_volatility_step(volatility, reset=reset)
+        if predicted_volatility is None:
+            return jsonify({
+                'error': 'Streaming step model not available',
+                'timestamp': iso_now()
+            }), 503
+
+        lambda_value = inference_service.calculate_lambda(predicted_volatility)
+
+        return jsonify({
+            'lambda1000': int(lambda_value * 1000),
+            'lambda': lambda_value,
+            'predicted_volatility': predicted_volatility,
+            'input_volatility': volatility,
+            'steps': inference_service.step_runner.steps,
+            'timestamp': iso_now()
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Streaming inference failed: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/volatility', methods=['GET'])
 def get_current_volatility():
     """Get current volatility from enhanced AI predictor"""
@@ -565,9 +806,9 @@ def get_current_volatility():
                 'volatility': volatility,
                 'lambda': lambda_value,
                 'lambda1000': int(lambda_value * 1000),
-                'price_history_length': len(inference_service.price_history),
-                'last_price': inference_service.price_history[-1] if inference_service.price_history else None,
-                'timestamp': datetime.now().isoformat()
+                'price_history_length': inference_service.price_history_length(),
+                'last_price': next(iter(inference_service.recent_price_records(1)), None),
+                'timestamp': iso_now()
             })
 
     except Exception as e:
@@ -575,6 +816,45 @@ def get_current_volatility():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/volatility/batch', methods=['GET'])
+def get_batch_volatility():
+    """Get volatility for several symbols from a single batched LSTM run"""
+    try:
+        if not inference_service.enhanced_predictor:
+            return jsonify({
+                'success': False,
+                'error': 'Enhanced predictor not available',
+                'timestamp': iso_now()
+            }), 503
+
+        symbols = request.args.get('symbols')
+        symbols = [s.strip() for s in symbols.split(',') if s.strip()] if symbols else None
+        summaries = inference_service.enhanced_predictor.get_prediction_summaries(symbols)
+
+        return jsonify({
+            'success': True,
+            'volatility': {
+                symbol: {
+                    'volatility': summary['lstm_volatility'],
+                    'historical_volatility': summary.get('historical_volatility'),
+                    'lambda': summary['lambda_coefficient'],
+                    'lambda1000': summary.get('lambda1000', int(summary['lambda_coefficient'] * 1000)),
+                    'current_price': summary.get('current_price'),
+                    'confidence': summary['confidence'],
+                    'method': summary.get('prediction_method'),
+                    'risk_level': summary.get('risk_assessment'),
+                    'data_points': summary.get('data_points')
+                }
+                for symbol, summary in summaries.items()
+            },
+            'timestamp': iso_now()
+        })
+
+    except Exception as e:
+        logger.error(f"❌ Batch volatility calculation failed: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 # New enhanced endpoint for price history summary
 @app.route('/enhanced/price-history', methods=['GET'])
 def get_enhanced_price_history():
@@ -585,13 +865,13 @@ def get_enhanced_price_history():
             return jsonify({
                 'success': True,
                 'price_data': summary,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': iso_now()
             })
         else:
             return jsonify({
                 'success': False,
                 'error': 'Enhanced predictor not available',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': iso_now()
             }), 503
 
     except Exception as e:
@@ -604,12 +884,12 @@ def get_price_feed():
     """Get recent price history"""
     try:
         recent_count = int(request.args.get('count', 24))
-        recent_prices = inference_service.price_history[-recent_count:]
+        recent_prices = inference_service.recent_price_records(recent_count)
 
         return jsonify({
             'prices': recent_prices,
             'count': len(recent_prices),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         })
 
     except Exception as e:
@@ -623,9 +903,10 @@ def get_model_info():
     return jsonify({
         'model_info': inference_service.model_info,
         'model_loaded': inference_service.session is not None,
-        'scaler_loaded': inference_service.scaler is not None,
+        'model_path': inference_service.model_path,
+        'model_precision': inference_service.model_precision,
         'price_monitoring_active': inference_service.ws is not None,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_now()
     })
 
 
@@ -653,7 +934,7 @@ def demo_inference():
                 'risk_level': 'low' if lambda_value > 1.4 else 'medium' if lambda_value > 0.8 else 'high',
                 'max_ltv': f"{lambda_value * 100:.1f}%"
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         })
 
     except Exception as e:
@@ -695,7 +976,7 @@ def verify_self_protocol():
             },
             'userAddress': user_address,
             'contractAddress': contract_address,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_now(),
             'verificationLevel': 'ENHANCED'
         }
 
@@ -708,7 +989,7 @@ def verify_self_protocol():
         return jsonify({
             'success': False,
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }), 500
 
 
@@ -729,7 +1010,7 @@ def get_self_verification_status(user_address):
             'countryVerified': True,
             'ofacClear': True,
             'humanVerified': True,
-            'verificationDate': datetime.now().isoformat(),
+            'verificationDate': iso_now(),
             'expiryDate': (datetime.now().replace(year=datetime.now().year + 1)).isoformat()
         }
 
@@ -0,0 +1,175 @@
+"""
+Batched ONNX Runtime inference with IO binding
+Scores several assets' feature sequences in a single session run, reusing
+preallocated input/output buffers instead of allocating per call. Also hosts
+the stateful single-step runner used for streaming inference.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import onnxruntime as ort
+
+
+def make_session_options(sequence_length: int = 24, intra_op_threads: int = 1,
+                         inter_op_threads: int = 1) -> ort.SessionOptions:
+    """Session options the inference service runs with (the graph optimization level is left to the caller)"""
+    sess_options = ort.SessionOptions()
+
+    # The predictor always feeds fixed-length windows: pin the exported dynamic sequence axis
+    # so ORT can plan memory statically and reuse the same allocation pattern per call
+    sess_options.add_free_dimension_override_by_name('sequence_length', sequence_length)
+    sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    sess_options.intra_op_num_threads = intra_op_threads
+    sess_options.inter_op_num_threads = inter_op_threads
+    sess_options.enable_mem_pattern = True
+    # Idle ORT workers sleep instead of spinning, so they don't steal cycles from IO threads
+    sess_options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+    sess_options.enable_cpu_mem_arena = True
+    return sess_options
+
+
+def model_feature_count(session, default: int = 5) -> int:
+    """Features per time step the model's input expects; default when that axis is dynamic"""
+    feature_dim = session.get_inputs()[0].shape[-1]
+    return feature_dim if isinstance(feature_dim, int) else default
+
+
+class BatchedVolatilityRunner:
+    """Zero-copy batched runner for a (batch, sequence_length, features) -> (batch, 1) model"""
+
+    def __init__(self, session, max_batch: int = 4, sequence_length: int = 24, features: Optional[int] = None):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+        if features is None:
+            features = model_feature_count(session)
+        self.output_name = session.get_outputs()[0].name
+        self.io_binding = session.io_binding()
+
+        # Preallocated once; callers fill rows of input_buffer in place
+        self.input_buffer = np.zeros((max_batch, sequence_length, features), dtype=np.float32)
+        self.output_buffer = np.zeros((max_batch, 1), dtype=np.float32)
+
+    @property
+    def max_batch(self) -> int:
+        return self.input_buffer.shape[0]
+
+    def run(self, batch_size: int) -> np.ndarray:
+        """Run the model over the first batch_size rows of input_buffer"""
+        if not 0 < batch_size <= self.max_batch:
+            raise ValueError(f"batch_size must be in 1..{self.max_batch}, got {batch_size}")
+
+        # Leading rows of a C-contiguous buffer are contiguous, so ORT reads/writes them in place
+        self.io_binding.bind_input(
+            self.input_name, 'cpu', 0, np.float32,
+            (batch_size,) + self.input_buffer.shape[1:], self.input_buffer.ctypes.data
+        )
+        self.io_binding.bind_output(
+            self.output_name, 'cpu', 0, np.float32,
+            (batch_size, 1), self.output_buffer.ctypes.data
+        )
+        self.session.run_with_iobinding(self.io_binding)
+
+        return self.output_buffer[:batch_size, 0]
+
+    def predict(self, sequences: Sequence[np.ndarray]) -> np.ndarray:
+        """Copy (sequence_length, features) arrays into the input buffer and score them in one run"""
+        for row, sequence in enumerate(sequences):
+            self.input_buffer[row] = sequence
+        return self.run(len(sequences)).copy()
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item requests into batched calls of score_batch
+
+    Request threads call submit() and block; one worker thread gathers whatever arrives within
+    max_wait_ms (up to max_batch items) and scores it with a single score_batch(items) call,
+    which must return one result per item, in order.
+    """
+
+    def __init__(self, score_batch: Callable[[List], Sequence], max_batch: int, max_wait_ms: float = 2.0,
+                 name: str = 'micro-batcher'):
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._serve, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item):
+        """Score one item, batched with concurrent callers"""
+        future = Future()
+        self._requests.put((item, future))
+        return future.result()
+
+    def _collect(self):
+        """Block for the first request, then gather more until the batch is full or the window closes"""
+        batch = [self._requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Past the window, still take anything already queued
+                batch.append(self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _serve(self):
+        while True:
+            batch = self._collect()
+            try:
+                results = self.score_batch([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class StreamingStepRunner:
+    """Runs a (x_t, h, c) -> (y, h_next, c_next) step model, keeping the recurrent state between calls"""
+
+    def __init__(self, session):
+        self.session = session
+        inputs = session.get_inputs()
+        outputs = session.get_outputs()
+        self.input_names = [i.name for i in inputs]    # x_t, h_prev, c_prev
+        self.output_names = [o.name for o in outputs]  # y, h_next, c_next
+        self.io_binding = session.io_binding()
+
+        features = inputs[0].shape[1]
+        hidden_size = inputs[1].shape[1]
+        self.input_buffer = np.zeros((1, features), dtype=np.float32)
+        self.output_buffer = np.zeros((1, 1), dtype=np.float32)
+
+        # Two (h, c) slots used ping-pong: read one, write the other, then swap
+        self._state = np.zeros((2, 2, 1, hidden_size), dtype=np.float32)
+        self._current = 0
+        self.steps = 0
+
+    def reset(self):
+        """Forget the recurrent state"""
+        self._state.fill(0.0)
+        self._current = 0
+        self.steps = 0
+
+    def step(self) -> float:
+        """Advance one time step on input_buffer and return the prediction"""
+        h_prev, c_prev = self._state[self._current]
+        h_next, c_next = self._state[1 - self._current]
+
+        for name, array in zip(self.input_names, (self.input_buffer, h_prev, c_prev)):
+            self.io_binding.bind_input(name, 'cpu', 0, np.float32, array.shape, array.ctypes.data)
+        for name, array in zip(self.output_names, (self.output_buffer, h_next, c_next)):
+            self.io_binding.bind_output(name, 'cpu', 0, np.float32, array.shape, array.ctypes.data)
+        self.session.run_with_iobinding(self.io_binding)
+
+        self._current = 1 - self._current
+        self.steps += 1
+        return float(self.output_buffer[0, 0])
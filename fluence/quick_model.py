@@ -26,6 +26,24 @@ class SimpleVolatilityLSTM(nn.Module):
         output = self.fc(lstm_out[:, -1, :])  # Use last time step
         return output
 
+class StepLSTM(nn.Module):
+    """One time step of SimpleVolatilityLSTM, carrying (h, c) between calls for streaming inference"""
+    def __init__(self, model: SimpleVolatilityLSTM):
+        super(StepLSTM, self).__init__()
+        lstm = model.lstm
+        self.cell = nn.LSTMCell(lstm.input_size, lstm.hidden_size)
+        # Same gate layout (i, f, g, o) as nn.LSTM layer 0, so the weights copy over directly
+        with torch.no_grad():
+            self.cell.weight_ih.copy_(lstm.weight_ih_l0)
+            self.cell.weight_hh.copy_(lstm.weight_hh_l0)
+            self.cell.bias_ih.copy_(lstm.bias_ih_l0)
+            self.cell.bias_hh.copy_(lstm.bias_hh_l0)
+        self.fc = model.fc
+
+    def forward(self, x_t, h, c):
+        h_next, c_next = self.cell(x_t, (h, c))
+        return self.fc(h_next), h_next, c_next
+
 def create_quick_model():
     print("🚀 Creating quick LSTM model for production deployment...")
 
@@ -51,7 +69,7 @@ def create_quick_model():
         dummy_input,
         onnx_path,
         export_params=True,
-        opset_version=11,
+        opset_version=17,  # Newer opset exposes more ORT fusions (Gemm + activation) to the graph optimizer
         do_constant_folding=True,
         input_names=['price_sequence'],
         output_names=['volatility_prediction']
@@ -65,6 +83,47 @@ def create_quick_model():
     print(f"📍 Model saved to: {os.path.abspath(onnx_path)}")
     print(f"📏 Model size: {os.path.getsize(onnx_path) / 1024:.1f} KB")
 
+    # Single-step variant sharing the same weights, for streaming one tick at a time
+    step_path = "model/lstm_vol_step.onnx"
+    step_model = StepLSTM(model).eval()
+    hidden_size = model.lstm.hidden_size
+    print(f"📦 Exporting streaming step model to {step_path}...")
+    torch.onnx.export(
+        step_model,
+        (torch.randn(1, 5), torch.zeros(1, hidden_size), torch.zeros(1, hidden_size)),
+        step_path,
+        export_params=True,
+        opset_version=17,
+        do_constant_folding=True,
+        input_names=['price_step', 'h_prev', 'c_prev'],
+        output_names=['volatility_prediction', 'h_next', 'c_next']
+    )
+    onnx.checker.check_model(onnx.load(step_path))
+
+    # Int8 weights for CPU serving; infer.py picks this file up when QUANT_MODE=int8 (the default).
+    # ORT quantizes the LSTM op itself (DynamicQuantizeLSTM), so no unrolling is needed.
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = "model/lstm_vol_int8.onnx"
+    print(f"🗜️ Quantizing weights to int8: {int8_path}...")
+    quantize_dynamic(
+        onnx_path,
+        int8_path,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=['LSTM', 'MatMul', 'Gemm']
+    )
+    print(f"📏 Int8 model size: {os.path.getsize(int8_path) / 1024:.1f} KB")
+
+    # FP16 weights (half the bytes to stream per step); served when QUANT_MODE=fp16
+    fp16_path = "model/lstm_vol_fp16.onnx"
+    try:
+        from onnxconverter_common import float16
+        # Keep float32 inputs/outputs so the service's float32 buffers work unchanged
+        onnx.save(float16.convert_float_to_float16(onnx_model, keep_io_types=True), fp16_path)
+        print(f"📏 FP16 model size: {os.path.getsize(fp16_path) / 1024:.1f} KB")
+    except ImportError:
+        print("⚠️ onnxconverter-common not available, skipping FP16 export")
+
     return onnx_path
 
 if __name__ == "__main__":
@@ -8,12 +8,46 @@ import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error
 import onnx
+from onnx import compose, helper, numpy_helper
 import onnxruntime as ort
-import pickle
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
 import json
+import math
 import os
 import requests
 from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ort_batch import make_session_options
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; the synthetic-data recurrence then runs as plain Python
+    # and rolling features go through bottleneck/pandas
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # Optional; the stdlib parser accepts the same bytes payload
+    _json_loads = json.loads
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    # Optional; pandas rolling windows produce the same values
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    import onnxsim
+    ONNXSIM_AVAILABLE = True
+except ImportError:
+    # Optional; ORT still folds constants when the session loads
+    ONNXSIM_AVAILABLE = False
 
 try:
     import tensorflow as tf
@@ -26,12 +60,129 @@ except ImportError:
     print("⚠️ TensorFlow not available, using pre-trained model")
 
 
+def _ar1_path_loop(vol_noise, price_noise, base_price):
+    """Price path driven by AR(1) volatility clustering, from pre-drawn standard normal noise"""
+    hours = vol_noise.shape[0]
+    prices = np.empty(hours)
+    volatilities = np.empty(hours)
+    prices[0] = base_price
+    volatilities[0] = 0.1  # Initial volatility
+    price_floor = base_price * 0.1  # Prevent negative prices
+
+    for i in range(1, hours):
+        # Volatility follows AR(1) process
+        vol = 0.05 + 0.9 * volatilities[i - 1] + 0.1 * 0.02 * vol_noise[i]
+        # Clamp volatility; the select form lowers to branchless min/max under Numba
+        vol = 0.01 if vol < 0.01 else (0.5 if vol > 0.5 else vol)
+
+        # Price follows geometric Brownian motion with time-varying volatility
+        prices[i] = max(prices[i - 1] * (1.0 + vol * price_noise[i]), price_floor)
+        volatilities[i] = vol
+
+    return prices, volatilities
+
+
+# The recurrence is inherently serial, so it is JIT-compiled rather than vectorized
+_ar1_path = njit(cache=True, fastmath=True)(_ar1_path_loop) if NUMBA_AVAILABLE else _ar1_path_loop
+
+
+def _rolling_mean(values, window):
+    """Trailing moving average, NaN until the window holds `window` values"""
+    if BOTTLENECK_AVAILABLE:
+        return bn.move_mean(values, window, min_count=window)
+    return pd.Series(values).rolling(window=window).mean().to_numpy()
+
+
+def _rolling_std(values, window):
+    """Trailing sample std (ddof=1, like pandas), NaN until the window holds `window` values"""
+    if BOTTLENECK_AVAILABLE:
+        return bn.move_std(values, window, min_count=window, ddof=1)
+    return pd.Series(values).rolling(window=window).std().to_numpy()
+
+
+def _derive_features_loop(price, volume, window):
+    """Rows of returns, rolling volatility, price MA and volume MA, NaN until each window is full"""
+    n = price.shape[0]
+    out = np.full((4, n), np.nan)  # One contiguous row per feature, so threads never share cache lines
+    for i in range(1, n):
+        out[0, i] = price[i] / price[i - 1] - 1.0
+
+    # The three rolling features are independent: one per core. Each is a single O(n) pass that
+    # adds the entering value and removes the leaving one (Welford updates, like bottleneck's
+    # move_std); NaNs are left out of the running state and only full windows produce output.
+    for f in prange(3):
+        values = out[0] if f == 0 else (price if f == 1 else volume)
+        count = 0
+        mean = 0.0
+        squares = 0.0  # Sum of squared deviations from mean
+        for i in range(n):
+            entering = values[i]
+            if not math.isnan(entering):
+                count += 1
+                delta = entering - mean
+                mean += delta / count
+                squares += delta * (entering - mean)
+            if i >= window:
+                leaving = values[i - window]
+                if not math.isnan(leaving):
+                    count -= 1
+                    if count == 0:
+                        mean = 0.0
+                        squares = 0.0
+                    else:
+                        delta = leaving - mean
+                        mean -= delta / count
+                        squares -= delta * (leaving - mean)
+            if count == window:
+                if f == 0:
+                    out[1, i] = math.sqrt(max(squares, 0.0) / (window - 1))  # Sample std (ddof=1)
+                else:
+                    out[f + 1, i] = mean
+
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _derive_features_parallel = njit(parallel=True, cache=True)(_derive_features_loop)
+
+
+def _derive_features(price, volume, window=12):
+    """Returns, rolling volatility and price/volume moving averages, back to back over the raw arrays"""
+    if NUMBA_AVAILABLE:
+        returns, volatility, price_ma, volume_ma = _derive_features_parallel(price, volume, window)
+        return returns, volatility, price_ma, volume_ma
+
+    returns = np.empty_like(price)
+    returns[0] = np.nan
+    returns[1:] = price[1:] / price[:-1] - 1.0
+
+    volatility = _rolling_std(returns, window)
+    price_ma = _rolling_mean(price, window)
+    volume_ma = _rolling_mean(volume, window)
+    return returns, volatility, price_ma, volume_ma
+
+
+class SequenceCalibrationReader(CalibrationDataReader):
+    """Feeds training sequences to the static quantizer one at a time"""
+
+    def __init__(self, input_name, sequences):
+        self.input_name = input_name
+        self._sequences = iter(sequences)
+
+    def get_next(self):
+        sequence = next(self._sequences, None)
+        if sequence is None:
+            return None
+        return {self.input_name: sequence[np.newaxis]}
+
+
 class VolatilityPredictor:
     def __init__(self, sequence_length=24, features=5):
         self.sequence_length = sequence_length  # 24 hours of data
         self.features = features  # price, volume, volatility, etc.
         self.scaler = MinMaxScaler()
         self.model = None
+        self.calibration_data = None  # Training sequences used to calibrate INT8 activation ranges
 
     def fetch_historical_data(self, days=30):
         """
@@ -50,25 +201,32 @@ class VolatilityPredictor:
                 'interval': 'hourly'
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            # Hourly market chart is a few hundred KB of JSON; ask for it compressed
+            headers = {'Accept-Encoding': 'gzip'}
+            response = requests.get(url, params=params, headers=headers, timeout=10)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
 
-                # Extract price and volume data
-                prices = data['prices']
-                volumes = data['total_volumes']
+                # Extract price and volume data as [timestamp, value] arrays
+                prices = np.asarray(data['prices'], dtype=np.float64)
+                volumes = np.asarray(data['total_volumes'], dtype=np.float64)
+                price = prices[:, 1]
+                volume = volumes[:, 1]
 
-                # Create DataFrame
-                df = pd.DataFrame(prices, columns=['timestamp', 'price'])
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df['volume'] = [v[1] for v in volumes]
+                # Calculate additional features (12-hour windows)
+                returns, volatility, price_ma_12, volume_ma_12 = _derive_features(price, volume)
 
-                # Calculate additional features
-                df['returns'] = df['price'].pct_change()
-                df['volatility'] = df['returns'].rolling(window=12).std()  # 12-hour rolling volatility
-                df['price_ma_12'] = df['price'].rolling(window=12).mean()
-                df['volume_ma_12'] = df['volume'].rolling(window=12).mean()
+                # Create DataFrame
+                df = pd.DataFrame({
+                    'timestamp': pd.to_datetime(prices[:, 0], unit='ms'),
+                    'price': price,
+                    'volume': volume,
+                    'returns': returns,
+                    'volatility': volatility,
+                    'price_ma_12': price_ma_12,
+                    'volume_ma_12': volume_ma_12
+                })
 
                 # Drop NaN values
                 df = df.dropna()
@@ -94,39 +252,30 @@ class VolatilityPredictor:
         )
 
         # Generate price data with volatility patterns
-        np.random.seed(42)
         base_price = 0.00001  # SHIB-like price
 
-        # Generate price with volatility clustering
-        prices = [base_price]
-        volatilities = [0.1]  # Initial volatility
+        # All noise is drawn up front from one seeded PCG64 generator (no global RNG state);
+        # only the volatility clustering recurrence is serial
+        rng = np.random.default_rng(42)
+        vol_noise = rng.standard_normal(hours)
+        price_noise = rng.standard_normal(hours)
+        prices, volatilities = _ar1_path(vol_noise, price_noise, base_price)
+        volume = rng.lognormal(10, 1, hours)  # Synthetic volume
 
-        for i in range(1, hours):
-            # Volatility follows AR(1) process
-            vol = 0.05 + 0.9 * volatilities[-1] + 0.1 * np.random.normal(0, 0.02)
-            vol = max(0.01, min(vol, 0.5))  # Clamp volatility
-
-            # Price follows geometric Brownian motion with time-varying volatility
-            price_change = np.random.normal(0, vol)
-            new_price = prices[-1] * (1 + price_change)
-            new_price = max(new_price, base_price * 0.1)  # Prevent negative prices
-
-            prices.append(new_price)
-            volatilities.append(vol)
+        # Add derived features; volatility comes from the AR(1) path, not a rolling window
+        returns, _, price_ma_12, volume_ma_12 = _derive_features(prices, volume)
 
         # Create DataFrame
         df = pd.DataFrame({
             'timestamp': timestamps,
             'price': prices,
-            'volatility': volatilities
+            'volatility': volatilities,
+            'returns': returns,
+            'volume': volume,
+            'price_ma_12': price_ma_12,
+            'volume_ma_12': volume_ma_12
         })
 
-        # Add derived features
-        df['returns'] = df['price'].pct_change()
-        df['volume'] = np.random.lognormal(10, 1, len(df))  # Synthetic volume
-        df['price_ma_12'] = df['price'].rolling(window=12).mean()
-        df['volume_ma_12'] = df['volume'].rolling(window=12).mean()
-
         # Drop NaN values
         df = df.dropna()
 
@@ -147,17 +296,19 @@ class VolatilityPredictor:
         # Target: next-period volatility
         target = df['volatility'].values
 
-        return features_scaled, target
+        # Keras trains in fp32; cast once here rather than per batch
+        return features_scaled.astype(np.float32, copy=False), target.astype(np.float32, copy=False)
 
     def create_sequences(self, features, target):
         """Create sequences for LSTM training"""
-        X, y = [], []
+        # Zero-copy view of every window; the last one has no next-period target
+        windows = sliding_window_view(features, (self.sequence_length, features.shape[1]))[:-1, 0]
 
-        for i in range(self.sequence_length, len(features)):
-            X.append(features[i-self.sequence_length:i])
-            y.append(target[i])
+        # Materialized once, contiguous and in the fp32 Keras trains in
+        X = np.ascontiguousarray(windows, dtype=np.float32)
+        y = target[self.sequence_length:]
 
-        return np.array(X), np.array(y)
+        return X, y
 
     def build_model(self):
         """Build LSTM model for volatility prediction"""
@@ -197,6 +348,8 @@ class VolatilityPredictor:
         X_train, X_test = X[:split_idx], X[split_idx:]
         y_train, y_test = y[:split_idx], y[split_idx:]
 
+        self.calibration_data = X_train[:100]
+
         print(f"📈 Training data: {X_train.shape}")
         print(f"📊 Test data: {X_test.shape}")
 
@@ -209,11 +362,25 @@ class VolatilityPredictor:
             restore_best_weights=True
         )
 
+        # Cached, prefetched input pipeline: batch assembly overlaps the LSTM steps
+        train_ds = (
+            tf.data.Dataset.from_tensor_slices((X_train, y_train))
+            .cache()
+            .shuffle(1024)
+            .batch(32)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        val_ds = (
+            tf.data.Dataset.from_tensor_slices((X_test, y_test))
+            .cache()
+            .batch(32)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
         history = self.model.fit(
-            X_train, y_train,
+            train_ds,
             epochs=50,
-            batch_size=32,
-            validation_data=(X_test, y_test),
+            validation_data=val_ds,
             callbacks=[early_stopping],
             verbose=1
         )
@@ -236,26 +403,51 @@ class VolatilityPredictor:
         try:
             import tf2onnx
 
-            # Convert to ONNX
+            # Convert to ONNX; the fp32 graph stays in memory and only the quantized model hits disk
             model_proto, _ = tf2onnx.convert.from_keras(
                 self.model,
-                opset=13,
-                output_path=output_path
+                opset=17  # Node fusions in ORT's optimizer need a recent opset
             )
 
-            # Optimize and quantize
-            import onnxruntime.quantization as quant
-
-            quantized_path = output_path.replace('.onnx', '_quantized.onnx')
-            quant.quantize_dynamic(
+            # Bake the fitted scaler into the graph so callers feed raw features
+            model_proto = self.fold_scaler(model_proto)
+
+            # Collapse constant subgraphs before quantization sees them
+            if ONNXSIM_AVAILABLE:
+                simplified, check = onnxsim.simplify(model_proto)
+                if check:
+                    model_proto = simplified
+                else:
+                    print("⚠️ onnx-simplifier check failed, keeping the exported graph")
+
+            # Each Keras LSTM layer should become one ONNX LSTM node, which ORT runs as a fused
+            # kernel (all four gates in a single GEMM) rather than a chain of small MatMul/Sigmoid ops
+            if not any(node.op_type == 'LSTM' for node in model_proto.graph.node):
+                print("⚠️ LSTM layers exported as decomposed ops; ORT's fused LSTM kernel won't be used")
+
+            # Static INT8: activation ranges are calibrated offline instead of recomputed per inference,
+            # and symmetric scales keep every zero point at 0 so the integer GEMMs need no offset correction
+            # The folded graph scales its own input, so calibrate on raw (unscaled) sequences
+            raw_sequences = (self.calibration_data - self.scaler.min_) / self.scaler.scale_
+            calibration_reader = SequenceCalibrationReader(
+                model_proto.graph.input[0].name, raw_sequences.astype(np.float32)
+            )
+            quantize_static(
+                model_proto,
                 output_path,
-                quantized_path,
-                weight_type=quant.QuantType.QUInt8
+                calibration_reader,
+                quant_format=QuantFormat.QDQ,
+                per_channel=True,  # Per-output-channel weight scales: outliers don't inflate the whole tensor's range
+                reduce_range=False,
+                weight_type=QuantType.QInt8,
+                activation_type=QuantType.QInt8,
+                extra_options={
+                    'ActivationSymmetric': True,
+                    'WeightSymmetric': True,
+                    'MatMulConstBOnly': True  # Only MatMuls against constant weights
+                }
             )
 
-            # Use quantized model
-            os.rename(quantized_path, output_path)
-
             print(f"✅ ONNX model saved: {output_path}")
 
             # Test ONNX model
@@ -265,22 +457,57 @@ class VolatilityPredictor:
             print("⚠️ tf2onnx not available, saving TensorFlow model")
             self.model.save('model/lstm_vol.h5')
 
+    def fold_scaler(self, model_proto):
+        """Prepend the fitted MinMaxScaler (x * scale_ + min_) to the model as Mul/Add on its input"""
+        graph_input = model_proto.graph.input[0]
+        scaled_name = f"{graph_input.name}_scaled"
+
+        scaler_graph = helper.make_graph(
+            nodes=[
+                helper.make_node('Mul', [graph_input.name, 'scaler_scale'], ['scaler_mul'], name='scaler_mul'),
+                helper.make_node('Add', ['scaler_mul', 'scaler_min'], [scaled_name], name='scaler_add')
+            ],
+            name='minmax_scaler',
+            inputs=[graph_input],
+            outputs=[helper.make_tensor_value_info(scaled_name, graph_input.type.tensor_type.elem_type, None)],
+            initializer=[
+                numpy_helper.from_array(self.scaler.scale_.astype(np.float32), 'scaler_scale'),
+                numpy_helper.from_array(self.scaler.min_.astype(np.float32), 'scaler_min')
+            ]
+        )
+        scaler_model = helper.make_model(
+            scaler_graph, opset_imports=model_proto.opset_import, ir_version=model_proto.ir_version
+        )
+
+        # Graph input name is unchanged, so infer.py feeds the model exactly as before
+        return compose.merge_models(scaler_model, model_proto, io_map=[(scaled_name, graph_input.name)])
+
     def test_onnx_model(self, model_path):
         """Test ONNX model inference"""
         print("🧪 Testing ONNX model...")
 
         try:
-            # Load ONNX model
-            session = ort.InferenceSession(model_path)
-
-            # Create test input
+            # Load ONNX model exactly as the inference service does, with full graph optimization.
+            # No optimized sidecar is saved here: ENABLE_ALL output is tied to this host, and the
+            # service writes its own on first start.
+            sess_options = make_session_options(self.sequence_length)
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = ort.InferenceSession(model_path, sess_options, providers=['CPUExecutionProvider'])
+
+            # Create test input and a preallocated output buffer, both bound once
             test_input = np.random.random((1, self.sequence_length, self.features)).astype(np.float32)
+            output = np.empty((1, 1), dtype=np.float32)
 
-            # Run inference
-            input_name = session.get_inputs()[0].name
-            result = session.run(None, {input_name: test_input})
+            io_binding = session.io_binding()
+            io_binding.bind_cpu_input(session.get_inputs()[0].name, test_input)
+            io_binding.bind_output(
+                session.get_outputs()[0].name, 'cpu', 0, np.float32, output.shape, output.ctypes.data
+            )
 
-            predicted_volatility = result[0][0][0]
+            # Run inference; ORT writes straight into the bound output buffer
+            session.run_with_iobinding(io_binding)
+
+            predicted_volatility = output[0][0]
             print(f"✅ ONNX test successful! Predicted volatility: {predicted_volatility:.4f}")
 
             # Save model info
@@ -301,13 +528,6 @@ class VolatilityPredictor:
         except Exception as e:
             print(f"❌ ONNX test failed: {e}")
 
-    def save_scaler(self, path='model/scaler.pkl'):
-        """Save the feature scaler"""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'wb') as f:
-            pickle.dump(self.scaler, f)
-        print(f"✅ Scaler saved: {path}")
-
 
 def create_minimal_onnx_model():
     """Create a minimal ONNX model if TensorFlow is not available"""
@@ -330,13 +550,14 @@ def create_minimal_onnx_model():
     weights = np.random.random((120, 1)).astype(np.float32)  # 24*5 = 120 inputs
     bias = np.array([0.1], dtype=np.float32)
 
-    # Create weight and bias tensors
-    weight_tensor = helper.make_tensor(
-        'weights', TensorProto.FLOAT, [120, 1], weights.flatten()
-    )
-    bias_tensor = helper.make_tensor(
-        'bias', TensorProto.FLOAT, [1], bias
-    )
+    # Ship the weights pre-quantized: symmetric int8 with a single scale
+    weight_scale = np.abs(weights).max() / 127
+    weights_int8 = np.round(weights / weight_scale).astype(np.int8)
+
+    # Create weight and bias tensors (stored as raw bytes, not per-element protobuf fields)
+    weight_tensor = numpy_helper.from_array(weights_int8, 'weights')
+    weight_scale_tensor = numpy_helper.from_array(np.array(weight_scale, dtype=np.float32), 'weight_scale')
+    bias_tensor = numpy_helper.from_array(bias, 'bias')
 
     # Create nodes
     reshape_node = helper.make_node(
@@ -346,13 +567,43 @@ def create_minimal_onnx_model():
         name='reshape'
     )
 
+    # Integer matmul: quantize the activations per call, accumulate in int32, rescale to float
+    quantize_node = helper.make_node(
+        'DynamicQuantizeLinear',
+        inputs=['reshaped'],
+        outputs=['reshaped_quant', 'input_scale', 'input_zero_point'],
+        name='quantize_input'
+    )
+
     matmul_node = helper.make_node(
-        'MatMul',
-        inputs=['reshaped', 'weights'],
-        outputs=['matmul_out'],
+        'MatMulInteger',
+        inputs=['reshaped_quant', 'weights', 'input_zero_point'],
+        outputs=['matmul_int32'],
         name='matmul'
     )
 
+    cast_node = helper.make_node(
+        'Cast',
+        inputs=['matmul_int32'],
+        outputs=['matmul_float'],
+        to=TensorProto.FLOAT,
+        name='cast'
+    )
+
+    scale_node = helper.make_node(
+        'Mul',
+        inputs=['input_scale', 'weight_scale'],
+        outputs=['output_scale'],
+        name='output_scale'
+    )
+
+    dequantize_node = helper.make_node(
+        'Mul',
+        inputs=['matmul_float', 'output_scale'],
+        outputs=['matmul_out'],
+        name='dequantize'
+    )
+
     add_node = helper.make_node(
         'Add',
         inputs=['matmul_out', 'bias'],
@@ -361,17 +612,15 @@ def create_minimal_onnx_model():
     )
 
     # Create shape tensor for reshape
-    shape_tensor = helper.make_tensor(
-        'shape', TensorProto.INT64, [2], [1, 120]
-    )
+    shape_tensor = numpy_helper.from_array(np.array([1, 120], dtype=np.int64), 'shape')
 
     # Create the graph
     graph = helper.make_graph(
-        nodes=[reshape_node, matmul_node, add_node],
+        nodes=[reshape_node, quantize_node, matmul_node, cast_node, scale_node, dequantize_node, add_node],
         name='minimal_lstm',
         inputs=[input_tensor],
         outputs=[output_tensor],
-        initializer=[weight_tensor, bias_tensor, shape_tensor]
+        initializer=[weight_tensor, weight_scale_tensor, bias_tensor, shape_tensor]
     )
 
     # Create the model
@@ -419,9 +668,6 @@ def main():
         os.makedirs('model', exist_ok=True)
         predictor.convert_to_onnx()
 
-        # Save scaler
-        predictor.save_scaler()
-
     else:
         print("⚡ Creating minimal demo model...")
         create_minimal_onnx_model()
@@ -430,8 +676,6 @@ def main():
     print("\n📁 Generated files:")
     print("   - model/lstm_vol.onnx (ONNX model)")
     print("   - model/model_info.json (Model metadata)")
-    if 'tf' in globals():
-        print("   - model/scaler.pkl (Feature scaler)")
 
 
 if __name__ == "__main__":